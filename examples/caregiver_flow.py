@@ -16,7 +16,9 @@ safe, explainable clinical decision support.
 
 import asyncio
 import logging
-from datetime import datetime
+import threading
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
 from typing import Any
 
 # Configure logging
@@ -28,51 +30,146 @@ logger = logging.getLogger("epcid.example.caregiver")
 
 # Import EPCID components
 from src.agents.escalation_agent import EscalationAgent
-from src.agents.guideline_rag_agent import GuidelineRAGAgent
+from src.agents.guideline_rag_agent import AGE_BUCKETS, GuidelineRAGAgent
 from src.agents.ingestion_agent import IngestionAgent
 from src.agents.phenotype_agent import PhenotypeAgent
 from src.agents.risk_agent import RiskAgent
-from src.core.memory import Memory
+from src.core.executor import AuditLogger
+from src.core.memory import Memory, SharedMemory
 from src.core.reasoning import ReasoningEngine
+from src.db.models import AuditAction
 from src.utils.explainability import ExplanationGenerator
 
+# Common low-risk symptom sets whose guideline results are precomputed
+COMMON_LOW_RISK_SYMPTOM_SETS = (
+    ("fever", "cough", "runny_nose"),
+    ("runny_nose", "sneezing", "mild_cough"),
+    ("cough", "runny_nose"),
+    ("runny_nose", "sneezing"),
+    ("cough",),
+    ("fever",),
+    ("rash",),
+)
 
-async def caregiver_symptom_check(
+
+def _build_pipeline() -> dict[str, Any]:
+    """
+    Build the shared components and agents used by the workflow.
+
+    Agents keep no per-request state outside ``run()``, so one pipeline can
+    serve many concurrent symptom checks.
+    """
+    shared_memory = SharedMemory.instance()
+    memory = shared_memory.root
+    reasoning_engine = ReasoningEngine()
+
+    return {
+        "memory": shared_memory,
+        "reasoning_engine": reasoning_engine,
+        "explainer": ExplanationGenerator(),
+        "ingestion": IngestionAgent(memory=memory, reasoning_engine=reasoning_engine),
+        "phenotype": PhenotypeAgent(memory=memory, reasoning_engine=reasoning_engine),
+        "risk": RiskAgent(memory=memory, reasoning_engine=reasoning_engine),
+        "guideline": GuidelineRAGAgent(memory=memory, reasoning_engine=reasoning_engine),
+        "escalation": EscalationAgent(memory=memory, reasoning_engine=reasoning_engine),
+        # Set by warm_guideline_cache
+        "guideline_cache_warmed": False,
+    }
+
+
+async def warm_guideline_cache(pipeline: dict[str, Any] | None = None) -> int:
+    """
+    Precompute guideline results for common low-risk requests.
+
+    Runs every COMMON_LOW_RISK_SYMPTOM_SETS entry at each age bucket through
+    the guideline agent in one batch, filling its retrieval cache, so
+    matching requests skip retrieval until the cache TTL expires. Care
+    guidance is not precomputed: its visit packet is specific to each child.
+
+    Returns:
+        Number of requests precomputed
+    """
+    pipeline = pipeline or _get_pipeline()
+
+    # One representative age per bucket, plus unknown age
+    ages = [None, *(upper - 1 for upper in AGE_BUCKETS), AGE_BUCKETS[-1]]
+    guideline_inputs = [
+        {
+            "symptoms": list(symptoms),
+            "demographics": {"age_months": age_months},
+            "risk_tier": "LOW",
+        }
+        for symptoms in COMMON_LOW_RISK_SYMPTOM_SETS
+        for age_months in ages
+    ]
+    await pipeline["guideline"].process_batch(guideline_inputs)
+    pipeline["guideline_cache_warmed"] = True
+
+    logger.info("Precomputed %d guideline requests", len(guideline_inputs))
+    return len(guideline_inputs)
+
+
+_pipeline: dict[str, Any] | None = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline() -> dict[str, Any]:
+    """Get the process-wide pipeline, building it on first use."""
+    global _pipeline
+
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = _build_pipeline()
+    return _pipeline
+
+
+async def caregiver_symptom_check_stream(
     input_data: dict[str, Any],
-) -> dict[str, Any]:
+    pipeline: dict[str, Any] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
     """
-    Complete caregiver symptom check workflow.
+    Caregiver symptom check workflow that yields results stage by stage.
+
+    Events are dicts with a ``stage`` key:
+        - ``started``: ``timestamp`` and ``child_id``
+        - ``ingestion``, ``phenotypes``, ``risk``, ``guidelines``,
+          ``escalation``: the stage summary under ``result``
+        - ``assessment``: the final assessment under ``result``
+        - ``error``: the workflow stopped; message under ``error``
 
     Args:
-        input_data: Dict containing:
-            - child_id: Unique identifier for the child
-            - demographics: Age, weight, etc.
-            - symptoms: List of symptoms
-            - vitals: Temperature, etc.
-            - medications: Current medications (optional)
-            - symptom_duration: How long symptoms have been present
+        input_data: Same input as caregiver_symptom_check
+        pipeline: Optional components to use instead of the shared pipeline
 
-    Returns:
-        Complete assessment with guidance
+    Yields:
+        One event per completed stage
     """
     logger.info("Starting caregiver symptom check workflow")
 
-    # Initialize shared components
-    memory = Memory()
-    reasoning_engine = ReasoningEngine()
-    explainer = ExplanationGenerator()
-
-    # Initialize agents
-    ingestion_agent = IngestionAgent(memory=memory, reasoning_engine=reasoning_engine)
-    phenotype_agent = PhenotypeAgent(memory=memory, reasoning_engine=reasoning_engine)
-    risk_agent = RiskAgent(memory=memory, reasoning_engine=reasoning_engine)
-    guideline_agent = GuidelineRAGAgent(memory=memory, reasoning_engine=reasoning_engine)
-    escalation_agent = EscalationAgent(memory=memory, reasoning_engine=reasoning_engine)
-
-    results = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "child_id": input_data.get("child_id"),
-        "stages": {},
+    # Initialize shared components and agents
+    pipeline = pipeline or _get_pipeline()
+    explainer = pipeline["explainer"]
+    ingestion_agent = pipeline["ingestion"]
+    phenotype_agent = pipeline["phenotype"]
+    risk_agent = pipeline["risk"]
+    guideline_agent = pipeline["guideline"]
+    escalation_agent = pipeline["escalation"]
+
+    # Per-child view of the shared memory, used by every stage; only the
+    # semantic store is shared. Requests without a child ID get a throwaway
+    # memory so unrelated caregivers never mix.
+    child_id = input_data.get("child_id")
+    shared_memory = pipeline["memory"]
+    if child_id:
+        memory = shared_memory.namespace(child_id)
+    else:
+        memory = Memory(semantic=shared_memory.semantic)
+
+    yield {
+        "stage": "started",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "child_id": child_id,
     }
 
     # =====================================
@@ -80,17 +177,20 @@ async def caregiver_symptom_check(
     # =====================================
     logger.info("Stage 1: Data ingestion and normalization")
 
-    ingestion_response = await ingestion_agent.run(input_data)
-    results["stages"]["ingestion"] = {
-        "status": ingestion_response.status.value,
-        "quality_score": ingestion_response.data.get("quality_score"),
-        "warnings": ingestion_response.warnings,
+    ingestion_response = await ingestion_agent.run(input_data, memory=memory)
+    yield {
+        "stage": "ingestion",
+        "result": {
+            "status": ingestion_response.status.value,
+            "quality_score": ingestion_response.data.get("quality_score"),
+            "warnings": ingestion_response.warnings or [],
+        },
     }
 
     if not ingestion_response.success:
         logger.error("Ingestion failed")
-        results["error"] = "Data ingestion failed"
-        return results
+        yield {"stage": "error", "error": "Data ingestion failed"}
+        return
 
     normalized_data = ingestion_response.data.get("normalized", {})
 
@@ -103,12 +203,15 @@ async def caregiver_symptom_check(
         "normalized": normalized_data,
     }
 
-    phenotype_response = await phenotype_agent.run(phenotype_input)
-    results["stages"]["phenotypes"] = {
-        "status": phenotype_response.status.value,
-        "phenotype_count": phenotype_response.data.get("phenotype_count"),
-        "clinical_state": phenotype_response.data.get("clinical_state"),
-        "severe_phenotypes": phenotype_response.data.get("severe_phenotypes"),
+    phenotype_response = await phenotype_agent.run(phenotype_input, memory=memory)
+    yield {
+        "stage": "phenotypes",
+        "result": {
+            "status": phenotype_response.status.value,
+            "phenotype_count": phenotype_response.data.get("phenotype_count"),
+            "clinical_state": phenotype_response.data.get("clinical_state"),
+            "severe_phenotypes": phenotype_response.data.get("severe_phenotypes"),
+        },
     }
 
     phenotypes = phenotype_response.data.get("phenotypes", [])
@@ -123,22 +226,28 @@ async def caregiver_symptom_check(
         "phenotypes": phenotypes,
     }
 
-    risk_response = await risk_agent.run(risk_input)
-    results["stages"]["risk"] = {
-        "status": risk_response.status.value,
-        "risk_tier": risk_response.data.get("risk_tier"),
-        "risk_score": risk_response.data.get("risk_score"),
-        "confidence": risk_response.data.get("confidence"),
-        "triggered_rules": risk_response.data.get("triggered_rules"),
-        "risk_factors": risk_response.data.get("risk_factors"),
+    risk_response = await risk_agent.run(risk_input, memory=memory)
+    yield {
+        "stage": "risk",
+        "result": {
+            "status": risk_response.status.value,
+            "risk_tier": risk_response.data.get("risk_tier"),
+            "risk_score": risk_response.data.get("risk_score"),
+            "confidence": risk_response.data.get("confidence"),
+            "triggered_rules": risk_response.data.get("triggered_rules"),
+            "risk_factors": risk_response.data.get("risk_factors"),
+        },
     }
 
     risk_tier = risk_response.data.get("risk_tier", "LOW")
 
     # =====================================
-    # Stage 4: Retrieve guidelines
+    # Stages 4 & 5: Guidelines and care guidance
     # =====================================
+    # Both stages depend only on the risk tier and normalized data, so they
+    # run concurrently instead of awaiting one after the other.
     logger.info("Stage 4: Retrieving guidelines")
+    logger.info("Stage 5: Generating care guidance")
 
     guideline_input = {
         "symptoms": normalized_data.get("symptoms", []),
@@ -146,18 +255,6 @@ async def caregiver_symptom_check(
         "risk_tier": risk_tier,
     }
 
-    guideline_response = await guideline_agent.run(guideline_input)
-    results["stages"]["guidelines"] = {
-        "status": guideline_response.status.value,
-        "result_count": guideline_response.data.get("result_count"),
-        "citations": guideline_response.data.get("citations"),
-    }
-
-    # =====================================
-    # Stage 5: Generate care guidance
-    # =====================================
-    logger.info("Stage 5: Generating care guidance")
-
     escalation_input = {
         "risk_tier": risk_tier,
         "symptoms": normalized_data.get("symptoms", []),
@@ -166,15 +263,50 @@ async def caregiver_symptom_check(
         "demographics": normalized_data.get("demographics", {}),
     }
 
-    escalation_response = await escalation_agent.run(
-        escalation_input,
-        context={"risk_assessment": risk_response.data},
+    guideline_response, escalation_response = await asyncio.gather(
+        guideline_agent.run(guideline_input, memory=memory),
+        escalation_agent.run(
+            escalation_input,
+            context={"risk_assessment": risk_response.data},
+            memory=memory,
+        ),
+        return_exceptions=True,
     )
-    results["stages"]["escalation"] = {
-        "status": escalation_response.status.value,
-        "escalation_type": escalation_response.data.get("escalation_type"),
-        "urgency": escalation_response.data.get("urgency"),
-        "primary_action": escalation_response.data.get("primary_action"),
+
+    if isinstance(guideline_response, BaseException):
+        logger.error("Guideline retrieval failed: %s", guideline_response)
+        guideline_result = {
+            "status": "failed",
+            "error": str(guideline_response),
+        }
+    else:
+        guideline_result = {
+            "status": guideline_response.status.value,
+            "result_count": guideline_response.data.get("result_count"),
+            "citations": guideline_response.data.get("citations"),
+        }
+    yield {"stage": "guidelines", "result": guideline_result}
+
+    if isinstance(escalation_response, BaseException):
+        logger.error("Care guidance generation failed: %s", escalation_response)
+        yield {
+            "stage": "escalation",
+            "result": {
+                "status": "failed",
+                "error": str(escalation_response),
+            },
+        }
+        yield {"stage": "error", "error": "Care guidance generation failed"}
+        return
+
+    yield {
+        "stage": "escalation",
+        "result": {
+            "status": escalation_response.status.value,
+            "escalation_type": escalation_response.data.get("escalation_type"),
+            "urgency": escalation_response.data.get("urgency"),
+            "primary_action": escalation_response.data.get("primary_action"),
+        },
     }
 
     # =====================================
@@ -193,24 +325,121 @@ async def caregiver_symptom_check(
         missing_data=risk_response.data.get("missing_data", []),
     )
 
-    results["assessment"] = {
-        "risk_tier": risk_tier,
-        "urgency": escalation_response.data.get("urgency"),
-        "primary_action": escalation_response.data.get("primary_action"),
-        "timeline": escalation_response.data.get("timeline"),
-        "guidance": escalation_response.data.get("guidance_message"),
-        "explanation": explanation.to_markdown(),
-        "checklist": escalation_response.data.get("checklist"),
-        "escalation_criteria": escalation_response.data.get("escalation_criteria"),
+    yield {
+        "stage": "assessment",
+        "result": {
+            "risk_tier": risk_tier,
+            "urgency": escalation_response.data.get("urgency"),
+            "primary_action": escalation_response.data.get("primary_action"),
+            "timeline": escalation_response.data.get("timeline"),
+            "guidance": escalation_response.data.get("guidance_message"),
+            "explanation": explanation.to_markdown(),
+            "checklist": escalation_response.data.get("checklist"),
+            "escalation_criteria": escalation_response.data.get("escalation_criteria"),
+        },
     }
 
-    logger.info(f"Workflow complete. Risk tier: {risk_tier}")
+    logger.info("Workflow complete. Risk tier: %s", risk_tier)
+
+
+async def caregiver_symptom_check(
+    input_data: dict[str, Any],
+    pipeline: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Complete caregiver symptom check workflow.
+
+    Args:
+        input_data: Dict containing:
+            - child_id: Unique identifier for the child
+            - demographics: Age, weight, etc.
+            - symptoms: List of symptoms
+            - vitals: Temperature, etc.
+            - medications: Current medications (optional)
+            - symptom_duration: How long symptoms have been present
+        pipeline: Optional components to use instead of the shared pipeline
+
+    Returns:
+        Complete assessment with guidance
+    """
+    results: dict[str, Any] = {}
+    stages: dict[str, Any] = {}
+
+    async for event in caregiver_symptom_check_stream(input_data, pipeline=pipeline):
+        stage = event["stage"]
+        if stage == "started":
+            results.update(timestamp=event["timestamp"], child_id=event["child_id"])
+            results["stages"] = stages
+        elif stage == "error":
+            results["error"] = event["error"]
+        elif stage == "assessment":
+            results["assessment"] = event["result"]
+        else:
+            stages[stage] = event["result"]
+
+    return results
+
+
+async def caregiver_symptom_check_batch(
+    inputs: list[dict[str, Any]],
+    concurrency: int = 16,
+    audit_logger: AuditLogger | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Run the caregiver symptom check for many children concurrently.
+
+    Args:
+        inputs: List of input dicts, as accepted by caregiver_symptom_check
+        concurrency: Maximum number of workflows in flight at once
+        audit_logger: Optional audit logger; one assessment audit row per
+            completed check is written with a single flush at the end
+
+    Returns:
+        Assessments in the same order as inputs
+    """
+    logger.info("Starting batch symptom check for %d children", len(inputs))
+
+    pipeline = _get_pipeline()
+    if not pipeline["guideline_cache_warmed"]:
+        await warm_guideline_cache(pipeline)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(input_data: dict[str, Any]) -> dict[str, Any]:
+        async with semaphore:
+            return await caregiver_symptom_check(input_data, pipeline=pipeline)
+
+    results = list(await asyncio.gather(*(run_one(inp) for inp in inputs)))
+
+    # Stage 4 is served from the guideline agent's retrieval cache on repeats
+    cache_stats = pipeline["guideline"].retrieval_cache.stats()
+    logger.info(
+        "Guideline cache: %d hits, %d misses (hit rate %.0f%%)",
+        cache_stats["hits"],
+        cache_stats["misses"],
+        cache_stats["hit_rate"] * 100,
+    )
+
+    if audit_logger is not None:
+        await audit_logger.flush(
+            [
+                {
+                    "action": AuditAction.ASSESSMENT,
+                    "resource_type": "symptom_check",
+                    "resource_id": result.get("child_id"),
+                    "details": {"risk_tier": result["assessment"]["risk_tier"]},
+                }
+                for result in results
+                if "assessment" in result
+            ]
+        )
+
     return results
 
 
 # Example usage
 async def main():
     """Run example caregiver workflow."""
+    await warm_guideline_cache()
 
     # Example 1: Moderate fever with respiratory symptoms
     print("\n" + "=" * 60)
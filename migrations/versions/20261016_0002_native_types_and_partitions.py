@@ -0,0 +1,360 @@
+"""Native UUIDs, JSONB, covering indexes and monthly partitions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+import re
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# Entity ids and user/child foreign keys stored as native UUIDs
+UUID_COLUMNS = {
+    "users": ["id"],
+    "children": ["id", "user_id"],
+    "symptoms": ["id", "child_id"],
+    "assessments": ["id", "child_id"],
+    "audit_logs": ["user_id"],
+    "refresh_tokens": ["id", "user_id"],
+    "environment_data": ["id"],
+}
+
+# Canonical UUID text, the only form the String(36) id columns should hold
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}")
+
+# Invalid ids listed per column when the upgrade refuses to run
+INVALID_IDS_SHOWN = 10
+
+# JSON columns stored as binary JSONB on PostgreSQL
+JSON_COLUMNS = {
+    "users": ["preferences"],
+    "children": ["medical_conditions", "allergies", "medications"],
+    "symptoms": ["measurements"],
+    "assessments": [
+        "symptoms_input",
+        "location",
+        "risk_factors",
+        "red_flags",
+        "warning_signs",
+        "secondary_recommendations",
+        "suggested_actions",
+        "environmental_data",
+    ],
+    "audit_logs": ["details"],
+    "environment_data": ["pollutants"],
+}
+
+# Foreign keys over UUID columns, as (table, column, referenced table, ondelete);
+# 0001 left them unnamed, so PostgreSQL named them <table>_<column>_fkey
+FOREIGN_KEYS = [
+    ("children", "user_id", "users", "CASCADE"),
+    ("symptoms", "child_id", "children", "CASCADE"),
+    ("assessments", "child_id", "children", "CASCADE"),
+    ("audit_logs", "user_id", "users", "SET NULL"),
+    ("refresh_tokens", "user_id", "users", "CASCADE"),
+]
+
+# Append-only, time-indexed tables range-partitioned by month on PostgreSQL
+PARTITIONED_TABLES = {"audit_logs": "timestamp", "symptoms": "recorded_at"}
+
+# Months past the current one to pre-create; src.db.database.ensure_partitions
+# keeps extending this (the API runs it at startup and daily) and must run
+# before inserts reach a month with no partition
+PARTITION_MONTHS_AHEAD = 3
+
+# One partition per month from the oldest row through PARTITION_MONTHS_AHEAD
+# months from now. There is no DEFAULT partition: rows parked there would make
+# CREATE TABLE ... PARTITION OF fail for their month.
+_CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    cur date;
+    stop date;
+BEGIN
+    SELECT date_trunc('month', coalesce(min("{column}"), now()))::date,
+           date_trunc('month', greatest(max("{column}"), now() + interval '{months} months'))::date
+      INTO cur, stop
+      FROM {source};
+    WHILE cur <= stop LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            '{table}_' || to_char(cur, 'YYYY_MM'),
+            '{table}',
+            cur,
+            (cur + interval '1 month')::date
+        );
+        cur := (cur + interval '1 month')::date;
+    END LOOP;
+END $$
+"""
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _drop_foreign_keys() -> None:
+    for table, column, _, _ in FOREIGN_KEYS:
+        op.drop_constraint(f"{table}_{column}_fkey", table, type_="foreignkey")
+
+
+def _create_foreign_keys() -> None:
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        op.create_foreign_key(
+            f"{table}_{column}_fkey", table, referent, [column], ["id"], ondelete=ondelete
+        )
+
+
+def _check_uuid_values() -> None:
+    """
+    Refuse to upgrade while an id column holds a value that is not a UUID.
+
+    PostgreSQL's ``::uuid`` cast would abort midway on such a row, and the
+    undashing done elsewhere would silently mangle it (``user-demo-001``
+    becomes ``userdemo001``), so the offending ids are listed up front.
+    """
+    if op.get_context().as_sql:
+        # Offline (--sql) runs have no rows to check
+        return
+
+    bind = op.get_bind()
+    invalid: list[str] = []
+    for table, columns in UUID_COLUMNS.items():
+        for column in columns:
+            values = bind.execute(
+                sa.text(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL")
+            ).scalars()
+            bad = [value for value in values if not _UUID_RE.fullmatch(value)]
+            if bad:
+                shown = ", ".join(map(repr, bad[:INVALID_IDS_SHOWN]))
+                if len(bad) > INVALID_IDS_SHOWN:
+                    shown += f" and {len(bad) - INVALID_IDS_SHOWN} more"
+                invalid.append(f"{table}.{column}: {shown}")
+
+    if invalid:
+        raise RuntimeError(
+            "Cannot convert id columns to UUID; these values are not UUIDs. "
+            "Reassign or remove the rows (and their references) and rerun the "
+            "upgrade:\n  " + "\n  ".join(invalid)
+        )
+
+
+def _alter_uuid_columns(to_uuid: bool) -> None:
+    """Switch the id columns between String(36) and Uuid."""
+    old_type, new_type = (sa.String(36), sa.Uuid()) if to_uuid else (sa.Uuid(), sa.String(36))
+
+    if _is_postgres():
+        cast = "uuid" if to_uuid else "varchar(36)"
+        for table, columns in UUID_COLUMNS.items():
+            for column in columns:
+                op.alter_column(
+                    table,
+                    column,
+                    type_=new_type,
+                    existing_type=old_type,
+                    postgresql_using=f"{column}::{cast}",
+                )
+        return
+
+    # Elsewhere Uuid is CHAR(32) holding the undashed hex form
+    for table, columns in UUID_COLUMNS.items():
+        for column in columns:
+            if to_uuid:
+                op.execute(f"UPDATE {table} SET {column} = REPLACE({column}, '-', '')")
+            else:
+                op.execute(
+                    f"UPDATE {table} SET {column} = "
+                    f"SUBSTR({column}, 1, 8) || '-' || SUBSTR({column}, 9, 4) || '-' || "
+                    f"SUBSTR({column}, 13, 4) || '-' || SUBSTR({column}, 17, 4) || '-' || "
+                    f"SUBSTR({column}, 21) WHERE LENGTH({column}) = 32"
+                )
+        with op.batch_alter_table(table) as batch:
+            for column in columns:
+                batch.alter_column(column, type_=new_type, existing_type=old_type)
+
+
+def _alter_json_columns(to_jsonb: bool) -> None:
+    """Switch the JSON columns between JSON and JSONB (PostgreSQL only)."""
+    old_type, new_type = (
+        (sa.JSON(), postgresql.JSONB()) if to_jsonb else (postgresql.JSONB(), sa.JSON())
+    )
+    cast = "jsonb" if to_jsonb else "json"
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=new_type,
+                existing_type=old_type,
+                postgresql_using=f"{column}::{cast}",
+            )
+
+
+def _recreate_table(table: str, partition_column: str | None) -> None:
+    """
+    Rebuild a table with the same columns, partitioned by month on
+    ``partition_column`` or unpartitioned when it is None.
+
+    PostgreSQL cannot partition (or unpartition) a table in place, so rows
+    are copied into a new table. Indexes and foreign keys are recreated by
+    the caller.
+    """
+    old = f"{table}_old"
+    op.rename_table(table, old)
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+
+    partition_by = f' PARTITION BY RANGE ("{partition_column}")' if partition_column else ""
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS){partition_by}"
+    )
+    # The partition key must be part of the primary key
+    key = ["id", partition_column] if partition_column else ["id"]
+    op.create_primary_key(f"{table}_pkey", table, key)
+
+    if partition_column:
+        op.execute(
+            _CREATE_MONTHLY_PARTITIONS.format(
+                table=table, column=partition_column, source=old, months=PARTITION_MONTHS_AHEAD
+            )
+        )
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    if table == "audit_logs":
+        # Keep the id sequence alive when the old table is dropped
+        op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.drop_table(old)
+
+
+def _create_symptom_indexes() -> None:
+    op.create_index("ix_symptoms_child_id", "symptoms", ["child_id"])
+    op.create_index("ix_symptoms_symptom_type", "symptoms", ["symptom_type"])
+    op.create_index("ix_symptoms_recorded_at", "symptoms", ["recorded_at"])
+    op.create_index("ix_symptoms_child_recorded", "symptoms", ["child_id", "recorded_at"])
+    op.create_index("ix_symptoms_type_recorded", "symptoms", ["symptom_type", "recorded_at"])
+
+
+def _create_audit_log_indexes(covering: bool) -> None:
+    if covering:
+        # user_id, action and resource_type lookups are served by the composite indexes
+        op.create_index(
+            "ix_audit_user_timestamp_covering",
+            "audit_logs",
+            ["user_id", sa.text("timestamp DESC")],
+            postgresql_include=["action", "resource_type"],
+        )
+    else:
+        op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+        op.create_index("ix_audit_logs_action", "audit_logs", ["action"])
+        op.create_index("ix_audit_logs_resource_type", "audit_logs", ["resource_type"])
+        op.create_index("ix_audit_user_timestamp", "audit_logs", ["user_id", "timestamp"])
+    op.create_index("ix_audit_logs_resource_id", "audit_logs", ["resource_id"])
+    op.create_index("ix_audit_logs_timestamp", "audit_logs", ["timestamp"])
+    op.create_index("ix_audit_action_timestamp", "audit_logs", ["action", "timestamp"])
+    op.create_index("ix_audit_resource", "audit_logs", ["resource_type", "resource_id"])
+
+
+def upgrade() -> None:
+    is_postgres = _is_postgres()
+
+    _check_uuid_values()
+    if is_postgres:
+        _drop_foreign_keys()
+    _alter_uuid_columns(to_uuid=True)
+
+    if is_postgres:
+        _alter_json_columns(to_jsonb=True)
+
+        for table, column in PARTITIONED_TABLES.items():
+            _recreate_table(table, column)
+        _create_symptom_indexes()
+        _create_audit_log_indexes(covering=True)
+        _create_foreign_keys()
+    else:
+        op.drop_index("ix_audit_logs_user_id", "audit_logs")
+        op.drop_index("ix_audit_logs_action", "audit_logs")
+        op.drop_index("ix_audit_logs_resource_type", "audit_logs")
+        op.drop_index("ix_audit_user_timestamp", "audit_logs")
+        op.create_index(
+            "ix_audit_user_timestamp_covering",
+            "audit_logs",
+            ["user_id", sa.text("timestamp DESC")],
+        )
+
+    # child_id and risk_level lookups are served by the composite indexes
+    op.drop_index("ix_assessments_child_id", "assessments")
+    op.drop_index("ix_assessments_risk_level", "assessments")
+    op.drop_index("ix_assessments_child_created", "assessments")
+    op.create_index(
+        "ix_assessments_child_created_covering",
+        "assessments",
+        ["child_id", sa.text("created_at DESC")],
+        postgresql_include=["risk_level", "risk_score"],
+    )
+
+    if is_postgres:
+        # GIN indexes for containment / key-existence filters on JSONB columns
+        op.create_index(
+            "ix_children_medical_conditions_gin",
+            "children",
+            ["medical_conditions"],
+            postgresql_using="gin",
+        )
+        op.create_index(
+            "ix_assessments_symptoms_gin", "assessments", ["symptoms_input"], postgresql_using="gin"
+        )
+        op.create_index(
+            "ix_assessments_risk_factors_gin",
+            "assessments",
+            ["risk_factors"],
+            postgresql_using="gin",
+        )
+        op.create_index(
+            "ix_audit_logs_details_gin", "audit_logs", ["details"], postgresql_using="gin"
+        )
+
+
+def downgrade() -> None:
+    is_postgres = _is_postgres()
+
+    if is_postgres:
+        op.drop_index("ix_audit_logs_details_gin", "audit_logs")
+        op.drop_index("ix_assessments_risk_factors_gin", "assessments")
+        op.drop_index("ix_assessments_symptoms_gin", "assessments")
+        op.drop_index("ix_children_medical_conditions_gin", "children")
+
+    op.drop_index("ix_assessments_child_created_covering", "assessments")
+    op.create_index("ix_assessments_child_id", "assessments", ["child_id"])
+    op.create_index("ix_assessments_risk_level", "assessments", ["risk_level"])
+    op.create_index("ix_assessments_child_created", "assessments", ["child_id", "created_at"])
+
+    if is_postgres:
+        _drop_foreign_keys()
+        # Dropping the partitioned tables drops their partitions and indexes
+        for table in PARTITIONED_TABLES:
+            _recreate_table(table, None)
+        _create_symptom_indexes()
+        _create_audit_log_indexes(covering=False)
+
+        _alter_json_columns(to_jsonb=False)
+    else:
+        op.drop_index("ix_audit_user_timestamp_covering", "audit_logs")
+        op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+        op.create_index("ix_audit_logs_action", "audit_logs", ["action"])
+        op.create_index("ix_audit_logs_resource_type", "audit_logs", ["resource_type"])
+        op.create_index("ix_audit_user_timestamp", "audit_logs", ["user_id", "timestamp"])
+
+    _alter_uuid_columns(to_uuid=False)
+    if is_postgres:
+        _create_foreign_keys()
@@ -11,7 +11,7 @@ CREATE EXTENSION IF NOT EXISTS pg_trgm;
 -- BCrypt hash for 'secret'
 INSERT INTO users (id, email, hashed_password, full_name, is_active, is_verified, created_at, updated_at)
 VALUES (
-    'user-demo-001',
+    '00000000-0000-4000-8000-000000000001',
     'demo@epcid.health',
     '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW',
     'Demo User',
@@ -24,8 +24,8 @@ VALUES (
 -- Create demo child
 INSERT INTO children (id, user_id, name, date_of_birth, gender, medical_conditions, allergies, medications, created_at, updated_at)
 VALUES (
-    'child-demo-001',
-    'user-demo-001',
+    '00000000-0000-4000-8000-000000000002',
+    '00000000-0000-4000-8000-000000000001',
     'Emma (Demo)',
     NOW() - INTERVAL '3 years',
     'female',
@@ -49,6 +49,7 @@ load_env() {
 run_migrations() {
     print_status "Running database migrations..."
     alembic upgrade head
+    python -c "from src.db.database import ensure_partitions; ensure_partitions()"
     print_status "Migrations complete"
 }
 
@@ -11,22 +11,43 @@ Provides common functionality for:
 """
 
 import asyncio
+import functools
 import logging
-import uuid
+import operator
+import os
+import sys
+import time
 from abc import ABC, abstractmethod
+from collections import ChainMap
+from collections.abc import Collection, Mapping, MutableMapping
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, TypeVar
+from typing import Any, TypeVar, cast
 
 from ..core.memory import Memory, MemoryType
 from ..core.reasoning import ReasoningChain, ReasoningEngine
+from ..utils.serialization import dumpb
 
 logger = logging.getLogger("epcid.agents")
 
+_UTC = timezone.utc  # noqa: UP017
 
-class AgentStatus(Enum):
-    """Agent execution status."""
+# asyncio.timeout() (3.11+) cancels in place; wait_for() wraps the coroutine in a Task
+_HAS_ASYNCIO_TIMEOUT = hasattr(asyncio, "timeout")
+
+# C-level attribute readers for memory items and episodes
+_get_content = operator.attrgetter("content")
+_get_episode_fields = operator.attrgetter("event_type", "outcome")
+
+
+def _epoch_ms(moment: datetime) -> int:
+    """Milliseconds since the Unix epoch."""
+    return int(moment.timestamp() * 1000)
+
+
+class AgentStatus(str, Enum):
+    """Agent execution status. Members are their string values."""
 
     IDLE = "idle"
     PROCESSING = "processing"
@@ -35,7 +56,7 @@ class AgentStatus(Enum):
     TIMEOUT = "timeout"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """Configuration for an agent."""
 
@@ -72,14 +93,22 @@ class AgentConfig:
             "custom_config": self.custom_config,
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to UTF-8 JSON bytes with the shared (orjson) codec."""
+        return dumpb(self.to_dict(), default=str)
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentResponse:
     """
     Standardized response from an agent.
 
     All agents return this structure to ensure consistency
     and explainability across the platform.
+
+    evidence, uncertainty_factors, warnings and metadata are None until
+    something is added (most responses leave them empty); use the add_*
+    helpers to append.
     """
 
     agent_name: str
@@ -92,58 +121,110 @@ class AgentResponse:
     # Explainability
     explanation: str | None = None
     reasoning_chain: ReasoningChain | None = None
-    evidence: list[str] = field(default_factory=list)
+    evidence: list[str] | None = None
 
     # Confidence and uncertainty
     confidence: float = 0.0
-    uncertainty_factors: list[str] = field(default_factory=list)
+    uncertainty_factors: list[str] | None = None
 
     # Warnings and errors
-    warnings: list[str] = field(default_factory=list)
+    warnings: list[str] | None = None
     error_message: str | None = None
 
     # Timing
-    started_at: datetime = field(
-        default_factory=lambda: datetime.now(__import__("datetime").timezone.utc)
-    )
+    started_at: datetime = field(default_factory=lambda: datetime.now(_UTC))
     completed_at: datetime | None = None
     duration_ms: float | None = None
+    # Epoch milliseconds of started_at / completed_at, recorded when those
+    # are set so serialization does not recompute them
+    started_at_ms: int = field(default=0, init=False, repr=False, compare=False)
+    completed_at_ms: int | None = field(default=None, init=False, repr=False, compare=False)
+    # Monotonic start (perf_counter_ns) set by BaseAgent.run(); 0 if unset
+    _start_ns: int = field(default=0, init=False, repr=False, compare=False)
 
     # Metadata
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] | None = None
+
+    def __post_init__(self) -> None:
+        self.started_at_ms = _epoch_ms(self.started_at)
+        if self.completed_at is not None:
+            self.completed_at_ms = _epoch_ms(self.completed_at)
 
     @property
     def success(self) -> bool:
         """Check if the agent completed successfully."""
-        return self.status == AgentStatus.COMPLETED
+        return self.status is AgentStatus.COMPLETED
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
+        # One dict display with fields inlined (no success property call)
         return {
             "agent_name": self.agent_name,
             "request_id": self.request_id,
             "status": self.status.value,
-            "success": self.success,
+            "success": self.status is AgentStatus.COMPLETED,
             "data": self.data,
             "explanation": self.explanation,
             "confidence": self.confidence,
-            "uncertainty_factors": self.uncertainty_factors,
-            "warnings": self.warnings,
+            "uncertainty_factors": self.uncertainty_factors or [],
+            "warnings": self.warnings or [],
             "error_message": self.error_message,
             "started_at": self.started_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            # Epoch milliseconds alongside, cheaper for clients to parse than ISO strings
+            "started_at_ms": self.started_at_ms,
+            "completed_at_ms": self.completed_at_ms,
             "duration_ms": self.duration_ms,
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to UTF-8 JSON bytes with the shared (orjson) codec."""
+        return dumpb(self.to_dict(), default=str)
+
+    def add_evidence(self, item: str) -> None:
+        """Append an evidence item."""
+        if self.evidence is None:
+            self.evidence = [item]
+        else:
+            self.evidence.append(item)
+
+    def add_uncertainty_factor(self, factor: str) -> None:
+        """Append an uncertainty factor."""
+        if self.uncertainty_factors is None:
+            self.uncertainty_factors = [factor]
+        else:
+            self.uncertainty_factors.append(factor)
+
+    def add_warning(self, warning: str) -> None:
+        """Append a warning."""
+        if self.warnings is None:
+            self.warnings = [warning]
+        else:
+            self.warnings.append(warning)
+
     def finalize(self) -> "AgentResponse":
         """Mark the response as complete and calculate duration."""
-        self.completed_at = datetime.now(__import__("datetime").timezone.utc)
-        if self.started_at:
+        self.completed_at = datetime.now(_UTC)
+        self.completed_at_ms = _epoch_ms(self.completed_at)
+        if self._start_ns:
+            self.duration_ms = (time.perf_counter_ns() - self._start_ns) / 1e6
+        elif self.started_at:
             delta = self.completed_at - self.started_at
             self.duration_ms = delta.total_seconds() * 1000
         return self
 
 
+@functools.cache
+def _default_reasoning_engine() -> ReasoningEngine:
+    """
+    Reasoning engine shared by agents constructed without one.
+
+    The engine holds only its configuration and stateless strategies.
+    Memory is not shared the same way: it holds each agent's observations.
+    """
+    return ReasoningEngine()
+
+
 T = TypeVar("T", bound="BaseAgent")
 
 
@@ -165,19 +246,23 @@ class BaseAgent(ABC):
         memory: Memory | None = None,
         reasoning_engine: ReasoningEngine | None = None,
     ):
+        # Interned so every response, log record and dict key for this agent
+        # shares one name string and compares by identity. Kept on the agent:
+        # the config belongs to the caller
+        self._name = sys.intern(config.name)
         self.config = config
         self.memory = memory or Memory()
-        self.reasoning_engine = reasoning_engine or ReasoningEngine()
+        self.reasoning_engine = reasoning_engine or _default_reasoning_engine()
 
         self._status = AgentStatus.IDLE
-        self._logger = logging.getLogger(f"epcid.agents.{config.name}")
+        self._logger = logging.getLogger(f"epcid.agents.{self._name}")
 
-        self._logger.info(f"Initialized {config.name} agent")
+        self._logger.info("Initialized %s agent", self._name)
 
     @property
     def name(self) -> str:
         """Get agent name."""
-        return self.config.name
+        return self._name
 
     @property
     def status(self) -> AgentStatus:
@@ -188,7 +273,7 @@ class BaseAgent(ABC):
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Process input and produce a response.
@@ -207,90 +292,135 @@ class BaseAgent(ABC):
     async def run(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
+        memory: Memory | None = None,
     ) -> AgentResponse:
         """
         Run the agent with error handling and logging.
 
         This wraps the process() method with common functionality.
+        ``memory`` overrides the agent's memory for this request, e.g. a
+        per-child namespace of SharedMemory.
         """
-        request_id = str(uuid.uuid4())[:12]
-        response = AgentResponse(
-            agent_name=self.name,
-            request_id=request_id,
-            status=AgentStatus.PROCESSING,
-        )
+        # 12 random hex chars, same width as the truncated UUIDs used elsewhere
+        request_id = os.urandom(6).hex()
+
+        # Checked per call (config can be toggled at runtime) but before any
+        # per-request setup, so disabled agents skip memory and timing
+        if not self.config.enabled:
+            return self._disabled_response(request_id)
+
+        memory = memory or self.memory
+        start_ns = time.perf_counter_ns()
 
         self._status = AgentStatus.PROCESSING
-        self._logger.info(f"Starting request {request_id}")
+        self._logger.info("Starting request %s", request_id)
 
         try:
-            # Check if agent is enabled
-            if not self.config.enabled:
-                response.status = AgentStatus.FAILED
-                response.error_message = f"Agent {self.name} is disabled"
-                return response.finalize()
-
             # Load context from memory if enabled
             if self.config.use_short_term_memory:
-                memory_context = self._load_memory_context(input_data)
-                context = {**(context or {}), **memory_context}
+                memory_context = self._load_memory_context(input_data, memory)
+                if memory_context and context:
+                    # Memory keys shadow caller keys without copying the caller's
+                    # context; writes only ever land in the per-request first map
+                    context = ChainMap(memory_context, cast(MutableMapping[str, Any], context))
+                elif memory_context:
+                    context = memory_context
 
             # Run with timeout
-            result = await asyncio.wait_for(
-                self.process(input_data, context),
-                timeout=self.config.timeout_seconds,
-            )
+            if _HAS_ASYNCIO_TIMEOUT:
+                async with asyncio.timeout(self.config.timeout_seconds):
+                    result = await self.process(input_data, context)
+            else:
+                result = await asyncio.wait_for(
+                    self.process(input_data, context), timeout=self.config.timeout_seconds
+                )
 
             # Store result in memory
             if self.config.use_short_term_memory:
-                self._store_in_memory(result)
+                self._store_in_memory(result, memory)
 
             response = result
             response.status = AgentStatus.COMPLETED
+            response._start_ns = start_ns
             self._status = AgentStatus.COMPLETED
 
         except TimeoutError:
-            response.status = AgentStatus.TIMEOUT
-            response.error_message = f"Agent timed out after {self.config.timeout_seconds}s"
+            response = self._failure_response(
+                request_id,
+                AgentStatus.TIMEOUT,
+                f"Agent timed out after {self.config.timeout_seconds}s",
+                start_ns,
+            )
             self._status = AgentStatus.TIMEOUT
-            self._logger.error(f"Request {request_id} timed out")
+            self._logger.error("Request %s timed out", request_id)
 
         except Exception as e:
-            response.status = AgentStatus.FAILED
-            response.error_message = str(e)
+            response = self._failure_response(request_id, AgentStatus.FAILED, str(e), start_ns)
             self._status = AgentStatus.FAILED
-            self._logger.error(f"Request {request_id} failed: {e}", exc_info=True)
+            self._logger.error("Request %s failed: %s", request_id, e, exc_info=True)
 
-        finally:
-            response = response.finalize()
-            self._log_response(response)
+        response = response.finalize()
+        self._log_response(response)
+        return response
 
+    def _failure_response(
+        self,
+        request_id: str,
+        status: AgentStatus,
+        error_message: str,
+        start_ns: int,
+    ) -> AgentResponse:
+        """Build the response for a request that failed after starting at ``start_ns``."""
+        elapsed = timedelta(microseconds=(time.perf_counter_ns() - start_ns) / 1000)
+        response = AgentResponse(
+            agent_name=self.name,
+            request_id=request_id,
+            status=status,
+            error_message=error_message,
+            started_at=datetime.now(_UTC) - elapsed,
+        )
+        response._start_ns = start_ns
         return response
 
-    def _load_memory_context(self, input_data: dict[str, Any]) -> dict[str, Any]:
+    def _disabled_response(self, request_id: str) -> AgentResponse:
+        """Build the FAILED response returned by a disabled agent."""
+        response = AgentResponse(
+            agent_name=self.name,
+            request_id=request_id,
+            status=AgentStatus.FAILED,
+            error_message=f"Agent {self.name} is disabled",
+        ).finalize()
+        self._log_response(response)
+        return response
+
+    def _load_memory_context(
+        self, input_data: dict[str, Any], memory: Memory | None = None
+    ) -> dict[str, Any]:
         """Load relevant context from memory."""
-        context = {}
+        memory = memory or self.memory
+        context: dict[str, Any] = {}
 
         # Get recent observations
-        recent = self.memory.short_term.get_recent(10)
+        recent = memory.short_term.get_recent(10)
         if recent:
-            context["recent_observations"] = [item.content for item in recent]
+            context["recent_observations"] = list(map(_get_content, recent))
 
         # Get child-specific context if child_id is present
         child_id = input_data.get("child_id")
         if child_id and self.config.use_episodic_memory:
-            episodes = self.memory.episodic.get_child_episodes(child_id, limit=5)
+            episodes = memory.episodic.get_child_episodes(child_id, limit=5)
             if episodes:
                 context["recent_episodes"] = [
-                    {"type": ep.event_type, "outcome": ep.outcome} for ep in episodes
+                    {"type": event_type, "outcome": outcome}
+                    for event_type, outcome in map(_get_episode_fields, episodes)
                 ]
 
         return context
 
-    def _store_in_memory(self, response: AgentResponse) -> None:
+    def _store_in_memory(self, response: AgentResponse, memory: Memory | None = None) -> None:
         """Store agent response in memory."""
-        self.memory.store(
+        (memory or self.memory).store(
             content={
                 "agent": self.name,
                 "data": response.data,
@@ -299,7 +429,7 @@ class BaseAgent(ABC):
             memory_type=MemoryType.SHORT_TERM,
             metadata={
                 "request_id": response.request_id,
-                "timestamp": datetime.now(__import__("datetime").timezone.utc).isoformat(),
+                "timestamp": datetime.now(_UTC).isoformat(),
             },
             importance=response.confidence,
         )
@@ -309,10 +439,11 @@ class BaseAgent(ABC):
         level = logging.INFO if response.success else logging.WARNING
         self._logger.log(
             level,
-            f"Request {response.request_id} completed: "
-            f"status={response.status.value}, "
-            f"confidence={response.confidence:.2f}, "
-            f"duration={response.duration_ms:.0f}ms",
+            "Request %s completed: status=%s, confidence=%.2f, duration=%.0fms",
+            response.request_id,
+            response.status.value,
+            response.confidence,
+            response.duration_ms,
         )
 
     def reason(
@@ -357,12 +488,12 @@ class BaseAgent(ABC):
 
     def validate_input(
         self,
-        input_data: dict[str, Any],
-        required_fields: list[str],
+        input_data: Mapping[str, Any],
+        required_fields: Collection[str],
     ) -> tuple[bool, list[str]]:
         """Validate that required fields are present in input."""
         missing = [f for f in required_fields if f not in input_data]
-        return len(missing) == 0, missing
+        return not missing, missing
 
     def get_config_value(self, key: str, default: Any = None) -> Any:
         """Get a value from custom config."""
@@ -12,19 +12,84 @@ This agent helps caregivers navigate the healthcare system effectively.
 """
 
 import logging
+import secrets
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any
+from typing import Any, ClassVar
 
 from .. import RISK_CRITICAL, RISK_HIGH, RISK_LOW, RISK_MODERATE
 from .base_agent import AgentConfig, AgentResponse, BaseAgent
 
 logger = logging.getLogger("epcid.agents.escalation")
 
-
-class EscalationType(Enum):
-    """Types of escalation actions."""
+# Guidance header emoji per escalation urgency
+_URGENCY_EMOJI = {
+    "immediate": "🚨",
+    "urgent": "⚠️",
+    "soon": "📋",
+    "routine": "📝",
+}
+
+# Questions suggested for every provider visit
+_BASE_PROVIDER_QUESTIONS = (
+    "What is the likely cause of these symptoms?",
+    "What warning signs should I watch for?",
+    "When should I bring my child back if symptoms don't improve?",
+)
+
+# Maximum questions in a visit packet
+_MAX_PROVIDER_QUESTIONS = 6
+
+# Symptoms that prompt the dehydration questions
+_GI_SYMPTOMS = frozenset({"vomiting", "diarrhea"})
+
+# Home monitoring tasks added to every checklist
+_MONITORING_TASKS = (
+    "Record temperature every 4 hours",
+    "Track fluid intake",
+    "Note any new symptoms",
+)
+
+# Seek-immediate-care criteria for every risk tier
+_UNIVERSAL_CRITERIA = (
+    "Difficulty breathing or rapid breathing",
+    "Blue color around lips or fingernails",
+    "Unable to wake child or unusually difficult to arouse",
+    "Severe or worsening headache with stiff neck",
+    "Seizure",
+)
+
+# Additional criteria for MODERATE and LOW tiers (home care)
+_HOME_CARE_CRITERIA = (
+    "Fever persists more than 3 days",
+    "Unable to keep any fluids down for 8+ hours",
+    "No wet diapers for 8+ hours (or no urination)",
+    "Rash that doesn't fade when pressed (petechiae)",
+    "Child appears much sicker than expected",
+)
+
+# Guidance after the symptom summary: when to escalate (universal criteria) and disclaimer
+_GUIDANCE_TAIL = (
+    "### ⚠️ Seek Immediate Care If:\n"
+    + "".join(f"- {criterion}\n" for criterion in _UNIVERSAL_CRITERIA)
+    + "\n---\n"
+    "*This guidance is not a substitute for professional medical advice. "
+    "When in doubt, seek medical evaluation.*"
+)
+
+
+def _format_medication(med: Any) -> str:
+    """Format a medication entry (dict with name/dose, or plain value)."""
+    if isinstance(med, dict):
+        name = med.get("name", "Unknown")
+        return f"{name} ({med['dose']})" if med.get("dose") else name
+    return str(med)
+
+
+class EscalationType(str, Enum):
+    """Types of escalation actions. Members are their string values."""
 
     EMERGENCY_911 = "emergency_911"
     EMERGENCY_ROOM = "emergency_room"
@@ -34,8 +99,8 @@ class EscalationType(Enum):
     HOME_MONITORING = "home_monitoring"
 
 
-class NotificationChannel(Enum):
-    """Notification channels."""
+class NotificationChannel(str, Enum):
+    """Notification channels. Members are their string values."""
 
     SMS = "sms"
     EMAIL = "email"
@@ -43,7 +108,7 @@ class NotificationChannel(Enum):
     SLACK = "slack"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EscalationPath:
     """An escalation path with actions and timeline."""
 
@@ -56,7 +121,7 @@ class EscalationPath:
     preparation_steps: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class VisitPacket:
     """Prepared packet for healthcare visit."""
 
@@ -70,8 +135,20 @@ class VisitPacket:
         default_factory=lambda: datetime.now(__import__("datetime").timezone.utc)
     )
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "summary": self.summary,
+            "symptoms_timeline": self.symptoms_timeline,
+            "vital_signs": self.vital_signs,
+            "medications": self.medications,
+            "questions_for_provider": self.questions_for_provider,
+            "attachments": self.attachments,
+            "generated_at": self.generated_at.isoformat(),
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Reminder:
     """A reminder for follow-up actions."""
 
@@ -83,6 +160,18 @@ class Reminder:
     channels: list[NotificationChannel]
     completed: bool = False
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "due_at": self.due_at.isoformat(),
+            "priority": self.priority,
+            "channels": [channel.value for channel in self.channels],
+            "completed": self.completed,
+        }
+
 
 class EscalationAgent(BaseAgent):
     """
@@ -161,6 +250,9 @@ class EscalationAgent(BaseAgent):
         ),
     }
 
+    # Static per-tier output, built on first use by _get_tier_output
+    _tier_cache: ClassVar[dict[str, dict[str, Any]]]
+
     def __init__(
         self,
         config: AgentConfig | None = None,
@@ -177,7 +269,7 @@ class EscalationAgent(BaseAgent):
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Generate escalation guidance and care navigation.
@@ -189,9 +281,7 @@ class EscalationAgent(BaseAgent):
         Returns:
             AgentResponse with escalation path and materials
         """
-        import uuid
-
-        request_id = str(uuid.uuid4())[:12]
+        request_id = secrets.token_hex(6)
 
         # Extract data
         risk_tier = input_data.get("risk_tier", RISK_LOW)
@@ -201,8 +291,14 @@ class EscalationAgent(BaseAgent):
         demographics = input_data.get("demographics", {})
         _ = input_data.get("has_image") or input_data.get("has_audio")
 
-        # Determine escalation path
-        escalation_path = self._get_escalation_path(risk_tier)
+        # Escalation path, path fields, checklist, escalation criteria,
+        # explanation and the guidance around the symptom summary depend only
+        # on the tier and are precomputed
+        tier_output = self._get_tier_output(risk_tier)
+
+        # The visit packet is left out for emergencies (the caregiver is
+        # calling 911) unless the caller asks for it
+        include_packet = (context or {}).get("include_packet", risk_tier != RISK_CRITICAL)
 
         # Generate visit packet
         visit_packet = self._generate_visit_packet(
@@ -214,41 +310,64 @@ class EscalationAgent(BaseAgent):
         )
 
         # Generate reminders
-        reminders = self._generate_reminders(escalation_path, risk_tier)
-
-        # Generate action checklist
-        checklist = self._generate_checklist(escalation_path, risk_tier)
-
-        # Generate when-to-escalate guidance
-        escalation_criteria = self._generate_escalation_criteria(risk_tier)
+        reminders = self._generate_reminders(tier_output["path"], risk_tier)
 
-        # Format the guidance message
-        guidance_message = self._format_guidance(
-            escalation_path,
-            visit_packet,
-            checklist,
-            escalation_criteria,
+        checklist = [dict(item) for item in tier_output["checklist"]]
+        escalation_criteria = list(tier_output["escalation_criteria"])
+        guidance_message = (
+            f"{tier_output['guidance_head']}\n{visit_packet.summary}\n"
+            f"{tier_output['guidance_tail']}"
         )
 
         return self.create_response(
             request_id=request_id,
             data={
-                "escalation_type": escalation_path.escalation_type.value,
-                "urgency": escalation_path.urgency,
-                "primary_action": escalation_path.primary_action,
-                "secondary_actions": escalation_path.secondary_actions,
-                "timeline": escalation_path.timeline,
-                "phone_number": escalation_path.phone_number,
-                "visit_packet": self._packet_to_dict(visit_packet),
-                "reminders": [self._reminder_to_dict(r) for r in reminders],
+                **tier_output["path_data"],
+                # Copied so callers never mutate the shared ESCALATION_PATHS list
+                "secondary_actions": list(tier_output["path_data"]["secondary_actions"]),
+                "visit_packet": visit_packet.to_dict() if include_packet else None,
+                "reminders": [r.to_dict() for r in reminders],
                 "checklist": checklist,
                 "escalation_criteria": escalation_criteria,
                 "guidance_message": guidance_message,
             },
             confidence=0.9,
-            explanation=self._generate_explanation(escalation_path, risk_tier),
+            explanation=tier_output["explanation"],
         )
 
+    def _get_tier_output(self, risk_tier: str) -> dict[str, Any]:
+        """Get the static per-tier output, building the class-wide cache on first use."""
+        cache = type(self).__dict__.get("_tier_cache")
+        if cache is None:
+            cache = {tier: self._build_tier_output(tier) for tier in self.ESCALATION_PATHS}
+            type(self)._tier_cache = cache
+        return cache.get(risk_tier) or self._build_tier_output(risk_tier)
+
+    def _build_tier_output(self, risk_tier: str) -> dict[str, Any]:
+        """Build the parts of the response that depend only on the risk tier."""
+        path = self._get_escalation_path(risk_tier)
+        checklist, escalation_criteria, guidance_head, guidance_tail = self._build_response(
+            path, risk_tier
+        )
+        path_data = {
+            "escalation_type": path.escalation_type.value,
+            "urgency": path.urgency,
+            "primary_action": path.primary_action,
+            "secondary_actions": path.secondary_actions,
+            "timeline": path.timeline,
+            "phone_number": path.phone_number,
+        }
+
+        return {
+            "path": path,
+            "path_data": path_data,
+            "checklist": checklist,
+            "escalation_criteria": escalation_criteria,
+            "guidance_head": guidance_head,
+            "guidance_tail": guidance_tail,
+            "explanation": self._generate_explanation(path, risk_tier),
+        }
+
     def _get_escalation_path(self, risk_tier: str) -> EscalationPath:
         """Get appropriate escalation path for risk tier."""
         return self.ESCALATION_PATHS.get(
@@ -262,17 +381,21 @@ class EscalationAgent(BaseAgent):
         vitals: dict[str, Any],
         medications: list,
         demographics: dict[str, Any],
-        context: dict[str, Any] | None,
+        context: Mapping[str, Any] | None,
     ) -> VisitPacket:
         """Generate a visit preparation packet."""
         context = context or {}
+        # One timestamp for the whole submission
+        now = datetime.now(__import__("datetime").timezone.utc)
+        now_iso = now.isoformat()
+
         # Build symptoms timeline
         symptoms_timeline = []
         for symptom in symptoms:
             symptoms_timeline.append(
                 {
                     "symptom": symptom,
-                    "noted_at": datetime.now(__import__("datetime").timezone.utc).isoformat(),
+                    "noted_at": now_iso,
                     "severity": "reported",
                 }
             )
@@ -293,15 +416,7 @@ class EscalationAgent(BaseAgent):
         questions = self._generate_provider_questions(symptoms, vitals)
 
         # Format medications
-        med_list = []
-        for med in medications:
-            if isinstance(med, dict):
-                med_str = med.get("name", "Unknown")
-                if med.get("dose"):
-                    med_str += f" ({med['dose']})"
-                med_list.append(med_str)
-            else:
-                med_list.append(str(med))
+        med_list = list(map(_format_medication, medications))
 
         # Build summary
         age_str = ""
@@ -312,13 +427,16 @@ class EscalationAgent(BaseAgent):
             else:
                 age_str = f"{months // 12} years old"
 
-        summary = f"Child: {age_str}\n"
-        summary += f"Current symptoms: {', '.join(symptoms[:5])}\n"
+        summary_parts = [
+            f"Child: {age_str}",
+            f"Current symptoms: {', '.join(symptoms[:5])}",
+        ]
 
         if vitals.get("temperature"):
-            summary += f"Temperature: {vitals['temperature']}°C\n"
+            summary_parts.append(f"Temperature: {vitals['temperature']}°C")
 
-        summary += f"Duration: {context.get('symptom_duration_hours', 'Unknown')} hours\n"
+        summary_parts.append(f"Duration: {context.get('symptom_duration_hours', 'Unknown')} hours")
+        summary = "\n".join(summary_parts) + "\n"
 
         return VisitPacket(
             summary=summary,
@@ -327,6 +445,7 @@ class EscalationAgent(BaseAgent):
             medications=med_list,
             questions_for_provider=questions,
             attachments=[],
+            generated_at=now,
         )
 
     def _generate_provider_questions(
@@ -335,29 +454,27 @@ class EscalationAgent(BaseAgent):
         vitals: dict[str, Any],
     ) -> list[str]:
         """Generate relevant questions to ask the provider."""
-        questions = [
-            "What is the likely cause of these symptoms?",
-            "What warning signs should I watch for?",
-            "When should I bring my child back if symptoms don't improve?",
-        ]
+        questions = list(_BASE_PROVIDER_QUESTIONS)
+        symptom_set = frozenset(symptoms)
 
         # Symptom-specific questions
-        if "fever" in symptoms or vitals.get("temperature", 0) >= 38:
+        if "fever" in symptom_set or vitals.get("temperature", 0) >= 38:
             questions.append("Should I give fever medication, and if so, what and how much?")
 
-        if "vomiting" in symptoms or "diarrhea" in symptoms:
+        if not _GI_SYMPTOMS.isdisjoint(symptom_set):
             questions.append("How can I prevent dehydration?")
             questions.append("When can my child resume normal eating?")
 
-        if "cough" in symptoms:
+        if "cough" in symptom_set:
             questions.append("What can I do to help with the cough?")
             questions.append("Should I be concerned about the type of cough?")
 
-        if "rash" in symptoms:
+        if "rash" in symptom_set:
             questions.append("Is this rash contagious?")
             questions.append("Should I apply any treatment to the rash?")
 
-        return questions[:6]  # Limit to 6 questions
+        del questions[_MAX_PROVIDER_QUESTIONS:]
+        return questions
 
     def _generate_reminders(
         self,
@@ -423,166 +540,66 @@ class EscalationAgent(BaseAgent):
 
         return reminders
 
-    def _generate_checklist(
+    def _build_response(
         self,
         path: EscalationPath,
         risk_tier: str,
-    ) -> list[dict[str, Any]]:
-        """Generate action checklist."""
-        checklist = []
+    ) -> tuple[list[dict[str, Any]], list[str], str, str]:
+        """
+        Build the checklist, escalation criteria and guidance message for a path.
+
+        The guidance message is returned in two parts, before and after the
+        per-request symptom summary; the part after it is the same for every
+        tier.
 
-        # Primary action
-        checklist.append(
+        Returns:
+            (checklist, escalation_criteria, guidance_head, guidance_tail)
+        """
+        # Primary action, preparation steps, then monitoring tasks
+        checklist: list[dict[str, Any]] = [
             {
                 "item": path.primary_action,
                 "priority": "high",
                 "category": "action",
                 "completed": False,
-            }
-        )
-
-        # Preparation steps
-        for step in path.preparation_steps:
-            checklist.append(
-                {
-                    "item": step,
-                    "priority": "medium",
-                    "category": "preparation",
-                    "completed": False,
-                }
-            )
-
-        # Monitoring tasks
-        monitoring_tasks = [
-            "Record temperature every 4 hours",
-            "Track fluid intake",
-            "Note any new symptoms",
-            "Log medication doses given",
+            },
+            *(
+                {"item": step, "priority": "medium", "category": "preparation", "completed": False}
+                for step in path.preparation_steps
+            ),
+            *(
+                {"item": task, "priority": "medium", "category": "monitoring", "completed": False}
+                for task in _MONITORING_TASKS
+            ),
         ]
 
-        for task in monitoring_tasks[:3]:
-            checklist.append(
-                {
-                    "item": task,
-                    "priority": "medium",
-                    "category": "monitoring",
-                    "completed": False,
-                }
-            )
-
-        return checklist
-
-    def _generate_escalation_criteria(self, risk_tier: str) -> list[str]:
-        """Generate criteria for when to escalate further."""
-        criteria = []
-
-        # Universal criteria
-        criteria.extend(
-            [
-                "Difficulty breathing or rapid breathing",
-                "Blue color around lips or fingernails",
-                "Unable to wake child or unusually difficult to arouse",
-                "Severe or worsening headache with stiff neck",
-                "Seizure",
-            ]
+        # Universal plus risk-tier specific criteria
+        criteria = list(_UNIVERSAL_CRITERIA)
+        if risk_tier in (RISK_MODERATE, RISK_LOW):
+            criteria.extend(_HOME_CARE_CRITERIA)
+
+        # Guidance sections up to the symptom summary (spliced in per request);
+        # visit preparation is not shown for emergencies
+        phone = f"**Phone:** {path.phone_number}\n\n" if path.phone_number else ""
+        secondary = (
+            "### Additional Steps\n" + "".join(f"- {a}\n" for a in path.secondary_actions) + "\n"
+            if path.secondary_actions
+            else ""
         )
-
-        # Risk-tier specific
-        if risk_tier in [RISK_MODERATE, RISK_LOW]:
-            criteria.extend(
-                [
-                    "Fever persists more than 3 days",
-                    "Unable to keep any fluids down for 8+ hours",
-                    "No wet diapers for 8+ hours (or no urination)",
-                    "Rash that doesn't fade when pressed (petechiae)",
-                    "Child appears much sicker than expected",
-                ]
-            )
-
-        return criteria
-
-    def _format_guidance(
-        self,
-        path: EscalationPath,
-        packet: VisitPacket,
-        checklist: list[dict],
-        escalation_criteria: list[str],
-    ) -> str:
-        """Format the complete guidance message."""
-        lines = []
-
-        # Header with urgency
-        urgency_emoji = {
-            "immediate": "🚨",
-            "urgent": "⚠️",
-            "soon": "📋",
-            "routine": "📝",
-        }
-
-        lines.append(f"# {urgency_emoji.get(path.urgency, '📋')} Care Guidance\n")
-
-        # Primary action
-        lines.append(f"## Recommended Action: {path.primary_action}")
-        lines.append(f"**Timeline:** {path.timeline}\n")
-
-        if path.phone_number:
-            lines.append(f"**Phone:** {path.phone_number}\n")
-
-        # Secondary actions
-        if path.secondary_actions:
-            lines.append("### Additional Steps")
-            for action in path.secondary_actions:
-                lines.append(f"- {action}")
-            lines.append("")
-
-        # Visit preparation
-        if path.urgency != "immediate":
-            lines.append("### Prepare for Visit")
-            for step in path.preparation_steps:
-                lines.append(f"☐ {step}")
-            lines.append("")
-
-        # Symptom summary
-        lines.append("### Current Symptom Summary")
-        lines.append(packet.summary)
-
-        # When to escalate
-        lines.append("### ⚠️ Seek Immediate Care If:")
-        for criterion in escalation_criteria[:5]:
-            lines.append(f"- {criterion}")
-
-        # Disclaimer
-        lines.append("\n---")
-        lines.append(
-            "*This guidance is not a substitute for professional medical advice. "
-            "When in doubt, seek medical evaluation.*"
+        preparation = (
+            "### Prepare for Visit\n" + "".join(f"☐ {s}\n" for s in path.preparation_steps) + "\n"
+            if path.urgency != "immediate"
+            else ""
+        )
+        guidance_head = (
+            f"# {_URGENCY_EMOJI.get(path.urgency, '📋')} Care Guidance\n\n"
+            f"## Recommended Action: {path.primary_action}\n"
+            f"**Timeline:** {path.timeline}\n\n"
+            f"{phone}{secondary}{preparation}"
+            "### Current Symptom Summary"
         )
 
-        return "\n".join(lines)
-
-    def _packet_to_dict(self, packet: VisitPacket) -> dict[str, Any]:
-        """Convert visit packet to dictionary."""
-        return {
-            "summary": packet.summary,
-            "symptoms_timeline": packet.symptoms_timeline,
-            "vital_signs": packet.vital_signs,
-            "medications": packet.medications,
-            "questions_for_provider": packet.questions_for_provider,
-            "attachments": packet.attachments,
-            "generated_at": packet.generated_at.isoformat(),
-        }
-
-    def _reminder_to_dict(self, reminder: Reminder) -> dict[str, Any]:
-        """Convert reminder to dictionary."""
-        return {
-            "id": reminder.id,
-            "title": reminder.title,
-            "description": reminder.description,
-            "due_at": reminder.due_at.isoformat(),
-            "priority": reminder.priority,
-            "channels": [c.value for c in reminder.channels],
-            "completed": reminder.completed,
-        }
+        return checklist, criteria, guidance_head, _GUIDANCE_TAIL
 
     def _generate_explanation(
         self,
@@ -590,20 +607,18 @@ class EscalationAgent(BaseAgent):
         risk_tier: str,
     ) -> str:
         """Generate explanation of escalation decision."""
-        lines = ["## Escalation Analysis\n"]
-
-        lines.append(f"**Risk Tier:** {risk_tier}")
-        lines.append(f"**Escalation Type:** {path.escalation_type.value}")
-        lines.append(f"**Urgency:** {path.urgency}")
-        lines.append(f"**Timeline:** {path.timeline}")
-
-        lines.append("\n### Rationale")
-        lines.append(
+        emergency = (
+            "\n\n⚠️ **This situation requires immediate emergency response.**"
+            if path.urgency == "immediate"
+            else ""
+        )
+        return (
+            "## Escalation Analysis\n\n"
+            f"**Risk Tier:** {risk_tier}\n"
+            f"**Escalation Type:** {path.escalation_type.value}\n"
+            f"**Urgency:** {path.urgency}\n"
+            f"**Timeline:** {path.timeline}\n\n"
+            "### Rationale\n"
             f"Based on the {risk_tier} risk assessment, the recommended "
-            f"course of action is to {path.primary_action.lower()}."
+            f"course of action is to {path.primary_action.lower()}.{emergency}"
         )
-
-        if path.urgency == "immediate":
-            lines.append("\n⚠️ **This situation requires immediate emergency response.**")
-
-        return "\n".join(lines)
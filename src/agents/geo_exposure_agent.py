@@ -13,16 +13,89 @@ and generates preventive guidance.
 """
 
 import logging
+import math
+import operator
+import secrets
+from bisect import bisect_right
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timezone
+from enum import IntEnum
+from functools import partial
+from typing import Any, NamedTuple
+
+import numpy as np
 
 from .base_agent import AgentConfig, AgentResponse, BaseAgent
 
 logger = logging.getLogger("epcid.agents.geo_exposure")
 
+_UTC = timezone.utc  # noqa: UP017
+
+# Pollen levels that raise an alert and a correlation
+_HIGH_POLLEN_LEVELS = frozenset({"high", "very_high"})
+
+
+# Recommendation groups, emitted in table order when their flag is set
+_REC_POOR_AIR = 1 << 0
+_REC_HOT = 1 << 1
+_REC_COLD = 1 << 2
+_REC_DRY = 1 << 3
+_REC_HUMID = 1 << 4
+_REC_RESPIRATORY = 1 << 5
+
+_RECOMMENDATIONS = (
+    (
+        _REC_POOR_AIR,
+        (
+            "Keep windows closed to reduce indoor air pollution",
+            "Consider using an air purifier with HEPA filter",
+            "Limit outdoor activities, especially vigorous exercise",
+        ),
+    ),
+    (
+        _REC_HOT,
+        (
+            "Ensure adequate hydration - offer water frequently",
+            "Schedule outdoor activities for cooler parts of the day",
+        ),
+    ),
+    (
+        _REC_COLD,
+        (
+            "Dress in warm layers for any outdoor time",
+            "Limit prolonged outdoor exposure",
+        ),
+    ),
+    (_REC_DRY, ("Use a humidifier to maintain indoor humidity",)),
+    (_REC_HUMID, ("Use dehumidifier or AC to reduce humidity",)),
+    (
+        _REC_RESPIRATORY,
+        (
+            "Track when respiratory symptoms worsen relative to outdoor time",
+            "Consider keeping a symptom diary noting weather conditions",
+        ),
+    ),
+)
+
+# Symptoms that prompt the respiratory tracking recommendations
+_RESPIRATORY_TRACKING_SYMPTOMS = frozenset({"cough", "wheezing", "difficulty_breathing"})
+
+# Highest AQI covered by the lookup table
+AQI_MAX = 500
+
 
-@dataclass
+def _build_aqi_lut(
+    categories: dict[tuple[int, int], tuple[str, str, str]],
+) -> tuple[tuple[str, str, str] | None, ...]:
+    """Expand AQI ranges into a table indexed by integer AQI (0 to AQI_MAX)."""
+    lut: list[tuple[str, str, str] | None] = [None] * (AQI_MAX + 1)
+    for (low, high), info in categories.items():
+        lut[low : high + 1] = [info] * (high - low + 1)
+    return tuple(lut)
+
+
+@dataclass(slots=True)
 class EnvironmentalConditions:
     """Current environmental conditions."""
 
@@ -35,23 +108,114 @@ class EnvironmentalConditions:
     uv_index: int | None = None
     pollen_level: str | None = None
     weather_condition: str | None = None
-    timestamp: datetime = field(
-        default_factory=lambda: datetime.now(__import__("datetime").timezone.utc)
-    )
+    timestamp: datetime = field(default_factory=partial(datetime.now, _UTC))
     location: str | None = None
+    # Lowercased pollen_level, for the threshold checks (not serialized)
+    pollen_level_lc: str | None = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.pollen_level_lc = self.pollen_level.lower() if self.pollen_level else None
+
+
+class Severity(IntEnum):
+    """Alert severity, ordered. Serialized as the lowercase name."""
 
+    LOW = 0
+    MODERATE = 1
+    HIGH = 2
+    SEVERE = 3
 
-@dataclass
-class ExposureAlert:
+
+# Risk score contribution and explanation marker, indexed by Severity
+_SEVERITY_WEIGHTS = (0.0, 0.1, 0.2, 0.3)
+_SEVERITY_EMOJI = ("🟢", "🟡", "🟠", "🔴")
+
+
+# EnvironmentalConditions fields emitted as-is by _conditions_to_dict (before timestamp)
+_CONDITION_FIELDS = (
+    "aqi",
+    "aqi_category",
+    "pm25",
+    "ozone",
+    "temperature_f",
+    "humidity_percent",
+    "uv_index",
+    "pollen_level",
+    "weather_condition",
+    "location",
+)
+_get_condition_fields = operator.attrgetter(*_CONDITION_FIELDS)
+
+
+class ExposureAlert(NamedTuple):
     """An environmental exposure alert."""
 
     alert_type: str
-    severity: str  # low, moderate, high, severe
+    severity: Severity
     title: str
     description: str
     recommendation: str
     related_symptoms: list[str]
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        alert = self._asdict()
+        alert["severity"] = self.severity.name.lower()
+        return alert
+
+
+def _aqi_recommendation(aqi: float) -> str:
+    """Get the recommendation for an AQI value."""
+    if aqi > 200:
+        return "Avoid all outdoor activity. Keep windows closed. Use air purifier if available."
+    elif aqi > 150:
+        return "Avoid prolonged outdoor exertion. Consider indoor activities."
+    elif aqi > 100:
+        return "Sensitive individuals should reduce prolonged outdoor activity."
+    return "Generally safe for outdoor activity."
+
+
+def _extreme_cold_alert(temp: float) -> ExposureAlert:
+    """Build the extreme cold alert."""
+    return ExposureAlert(
+        alert_type="temperature",
+        severity=Severity.HIGH,
+        title="Extreme Cold Alert",
+        description=f"Temperature is {temp}°F. Risk of cold-related illness.",
+        recommendation="Limit outdoor exposure. Dress in layers. Watch for hypothermia signs.",
+        related_symptoms=["respiratory_symptoms", "skin_irritation"],
+    )
+
+
+def _heat_advisory_alert(temp: float) -> ExposureAlert:
+    """Build the heat advisory alert."""
+    return ExposureAlert(
+        alert_type="temperature",
+        severity=Severity.MODERATE,
+        title="Heat Advisory",
+        description=f"Temperature is {temp}°F. Take precautions.",
+        recommendation="Limit strenuous outdoor activity. Ensure adequate hydration.",
+        related_symptoms=["fatigue", "headache"],
+    )
+
+
+def _extreme_heat_alert(temp: float) -> ExposureAlert:
+    """Build the extreme heat alert."""
+    return ExposureAlert(
+        alert_type="temperature",
+        severity=Severity.HIGH,
+        title="Extreme Heat Alert",
+        description=f"Temperature is {temp}°F. Risk of heat-related illness.",
+        recommendation="Limit outdoor activity. Stay hydrated. Watch for heat exhaustion signs.",
+        related_symptoms=["fatigue", "headache", "nausea", "dizziness"],
+    )
+
+
+# (conditions, alerts, correlations, recommendations, location) for a request
+_Analysis = tuple[
+    EnvironmentalConditions, list[ExposureAlert], list[dict[str, Any]], list[str], str | None
+]
+
 
 class GeoExposureAgent(BaseAgent):
     """
@@ -79,20 +243,35 @@ class GeoExposureAgent(BaseAgent):
         (301, 500): ("Hazardous", "severe", "Health emergency: avoid outdoor activity"),
     }
 
+    # (category, severity, description) by integer AQI, built from AQI_CATEGORIES
+    _AQI_LUT = _build_aqi_lut(AQI_CATEGORIES)
+
+    # AQI_CATEGORIES as (low, high, info) bins sorted by low, for non-integer readings
+    _AQI_BINS = tuple((low, high, info) for (low, high), info in sorted(AQI_CATEGORIES.items()))
+
     # Symptoms that may be environment-related
     ENVIRONMENT_SENSITIVE_SYMPTOMS = {
-        "respiratory": [
-            "cough",
-            "wheezing",
-            "difficulty_breathing",
-            "asthma_attack",
-            "nasal_congestion",
-            "runny_nose",
-            "sneezing",
-        ],
-        "skin": ["rash", "hives", "eczema_flare", "itchy_skin"],
-        "eye": ["itchy_eyes", "watery_eyes", "red_eyes"],
-        "general": ["headache", "fatigue", "nausea"],
+        "respiratory": frozenset(
+            {
+                "cough",
+                "wheezing",
+                "difficulty_breathing",
+                "asthma_attack",
+                "nasal_congestion",
+                "runny_nose",
+                "sneezing",
+            }
+        ),
+        "skin": frozenset({"rash", "hives", "eczema_flare", "itchy_skin"}),
+        "eye": frozenset({"itchy_eyes", "watery_eyes", "red_eyes"}),
+        "general": frozenset({"headache", "fatigue", "nausea"}),
+    }
+
+    # Reverse index of ENVIRONMENT_SENSITIVE_SYMPTOMS: symptom -> category
+    _SYMPTOM_TO_CATEGORY = {
+        symptom: category
+        for category, category_symptoms in ENVIRONMENT_SENSITIVE_SYMPTOMS.items()
+        for symptom in category_symptoms
     }
 
     # Temperature thresholds for alerts
@@ -103,6 +282,15 @@ class GeoExposureAgent(BaseAgent):
         "extreme_hot": 95,
     }
 
+    # Temperature bands for bisect_right: at or below extreme_cold (inclusive,
+    # hence nextafter), normal, hot, extreme_hot and above
+    _TEMP_CUTOFFS = (
+        math.nextafter(TEMP_THRESHOLDS["extreme_cold"], math.inf),
+        TEMP_THRESHOLDS["hot"],
+        TEMP_THRESHOLDS["extreme_hot"],
+    )
+    _TEMP_ALERTS = (_extreme_cold_alert, None, _heat_advisory_alert, _extreme_heat_alert)
+
     def __init__(
         self,
         config: AgentConfig | None = None,
@@ -119,7 +307,7 @@ class GeoExposureAgent(BaseAgent):
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Analyze environmental conditions and correlate with symptoms.
@@ -131,10 +319,45 @@ class GeoExposureAgent(BaseAgent):
         Returns:
             AgentResponse with exposure analysis and recommendations
         """
-        import uuid
+        analysis = self._analyze(input_data)
+        conditions, alerts = analysis[0], analysis[1]
+
+        # Calculate exposure risk score
+        risk_score = self._calculate_risk_score(conditions, alerts)
+
+        return self._respond(analysis, risk_score)
+
+    async def process_batch(
+        self,
+        inputs: list[dict[str, Any]],
+        context: Mapping[str, Any] | None = None,
+    ) -> list[AgentResponse]:
+        """
+        Analyze environmental conditions for many readings at once.
 
-        request_id = str(uuid.uuid4())[:12]
+        Each reading gets the same analysis as in process; the risk scores
+        for the whole batch are computed in one vectorized pass.
 
+        Args:
+            inputs: Input dicts, as accepted by process
+            context: Shared context, as accepted by process
+
+        Returns:
+            AgentResponses in the same order as inputs
+        """
+        analyses = [self._analyze(input_data) for input_data in inputs]
+        risk_scores = self._calculate_risk_scores([(a[0], a[1]) for a in analyses])
+
+        return [
+            self._respond(analysis, score)
+            for analysis, score in zip(analyses, risk_scores.tolist(), strict=True)
+        ]
+
+    def _analyze(self, input_data: dict[str, Any]) -> _Analysis:
+        """
+        Parse a request and derive everything but the risk score. Returns
+        (conditions, alerts, correlations, recommendations, location).
+        """
         # Extract data
         env_data = input_data.get("environmental", {})
         symptoms = input_data.get("symptoms", [])
@@ -152,14 +375,17 @@ class GeoExposureAgent(BaseAgent):
         # Generate recommendations
         recommendations = self._generate_recommendations(conditions, alerts, symptoms)
 
-        # Calculate exposure risk score
-        risk_score = self._calculate_risk_score(conditions, alerts)
+        return conditions, alerts, correlations, recommendations, location
+
+    def _respond(self, analysis: _Analysis, risk_score: float) -> AgentResponse:
+        """Build the response for an analyzed request and its risk score."""
+        conditions, alerts, correlations, recommendations, location = analysis
 
         return self.create_response(
-            request_id=request_id,
+            request_id=secrets.token_hex(6),
             data={
                 "conditions": self._conditions_to_dict(conditions),
-                "alerts": [self._alert_to_dict(a) for a in alerts],
+                "alerts": [a.to_dict() for a in alerts],
                 "correlations": correlations,
                 "recommendations": recommendations,
                 "risk_score": risk_score,
@@ -172,13 +398,8 @@ class GeoExposureAgent(BaseAgent):
     def _parse_conditions(self, env_data: dict[str, Any]) -> EnvironmentalConditions:
         """Parse environmental data into structured conditions."""
         aqi = env_data.get("aqi")
-        aqi_category = None
-
-        if aqi is not None:
-            for (low, high), (category, _, _) in self.AQI_CATEGORIES.items():
-                if low <= aqi <= high:
-                    aqi_category = category
-                    break
+        aqi_info = self._get_aqi_info(aqi) if aqi is not None else None
+        aqi_category = aqi_info[0] if aqi_info else None
 
         return EnvironmentalConditions(
             aqi=aqi,
@@ -202,7 +423,7 @@ class GeoExposureAgent(BaseAgent):
             aqi = conditions.aqi
 
             if aqi > 100:
-                severity = "high" if aqi > 150 else "moderate"
+                severity = Severity.HIGH if aqi > 150 else Severity.MODERATE
                 alerts.append(
                     ExposureAlert(
                         alert_type="air_quality",
@@ -220,50 +441,19 @@ class GeoExposureAgent(BaseAgent):
                     )
                 )
 
-        # Temperature alerts
-        if conditions.temperature_f is not None:
-            temp = conditions.temperature_f
-
-            if temp >= self.TEMP_THRESHOLDS["extreme_hot"]:
-                alerts.append(
-                    ExposureAlert(
-                        alert_type="temperature",
-                        severity="high",
-                        title="Extreme Heat Alert",
-                        description=f"Temperature is {temp}°F. Risk of heat-related illness.",
-                        recommendation="Limit outdoor activity. Stay hydrated. Watch for heat exhaustion signs.",
-                        related_symptoms=["fatigue", "headache", "nausea", "dizziness"],
-                    )
-                )
-            elif temp >= self.TEMP_THRESHOLDS["hot"]:
-                alerts.append(
-                    ExposureAlert(
-                        alert_type="temperature",
-                        severity="moderate",
-                        title="Heat Advisory",
-                        description=f"Temperature is {temp}°F. Take precautions.",
-                        recommendation="Limit strenuous outdoor activity. Ensure adequate hydration.",
-                        related_symptoms=["fatigue", "headache"],
-                    )
-                )
-            elif temp <= self.TEMP_THRESHOLDS["extreme_cold"]:
-                alerts.append(
-                    ExposureAlert(
-                        alert_type="temperature",
-                        severity="high",
-                        title="Extreme Cold Alert",
-                        description=f"Temperature is {temp}°F. Risk of cold-related illness.",
-                        recommendation="Limit outdoor exposure. Dress in layers. Watch for hypothermia signs.",
-                        related_symptoms=["respiratory_symptoms", "skin_irritation"],
-                    )
-                )
+        # Temperature alerts (one band lookup; NaN readings raise no alert)
+        temp = conditions.temperature_f
+        if temp is not None and not math.isnan(temp):
+            temp_alert = self._TEMP_ALERTS[bisect_right(self._TEMP_CUTOFFS, temp)]
+            if temp_alert is not None:
+                alerts.append(temp_alert(temp))
 
         # UV alerts
         if conditions.uv_index is not None and conditions.uv_index >= 8:
             alerts.append(
                 ExposureAlert(
                     alert_type="uv",
-                    severity="moderate" if conditions.uv_index < 11 else "high",
+                    severity=Severity.MODERATE if conditions.uv_index < 11 else Severity.HIGH,
                     title=f"High UV Index: {conditions.uv_index}",
                     description="Elevated risk of sun damage.",
                     recommendation="Apply sunscreen. Wear protective clothing and hat. Seek shade.",
@@ -272,11 +462,11 @@ class GeoExposureAgent(BaseAgent):
             )
 
         # Pollen alerts
-        if conditions.pollen_level and conditions.pollen_level.lower() in ["high", "very_high"]:
+        if conditions.pollen_level_lc in _HIGH_POLLEN_LEVELS:
             alerts.append(
                 ExposureAlert(
                     alert_type="pollen",
-                    severity="moderate",
+                    severity=Severity.MODERATE,
                     title=f"Pollen Level: {conditions.pollen_level}",
                     description="Elevated pollen may trigger allergies.",
                     recommendation="Keep windows closed. Consider allergy medication if appropriate.",
@@ -292,11 +482,20 @@ class GeoExposureAgent(BaseAgent):
         conditions: EnvironmentalConditions,
     ) -> list[dict[str, Any]]:
         """Find correlations between symptoms and environmental factors."""
-        correlations = []
+        correlations: list[dict[str, Any]] = []
 
-        # Check each symptom category
-        for category, category_symptoms in self.ENVIRONMENT_SENSITIVE_SYMPTOMS.items():
-            matching = [s for s in symptoms if s.lower() in category_symptoms]
+        # Bucket symptoms by category in one pass
+        buckets: dict[str, list[str]] = {}
+        for s in symptoms:
+            category = self._SYMPTOM_TO_CATEGORY.get(s.lower())
+            if category is not None:
+                buckets.setdefault(category, []).append(s)
+        if not buckets:
+            return correlations
+
+        # Check each symptom category (in declaration order)
+        for category in self.ENVIRONMENT_SENSITIVE_SYMPTOMS:
+            matching = buckets.get(category)
 
             if not matching:
                 continue
@@ -326,10 +525,7 @@ class GeoExposureAgent(BaseAgent):
                     )
 
             elif category == "skin" or category == "eye":
-                if conditions.pollen_level and conditions.pollen_level.lower() in [
-                    "high",
-                    "very_high",
-                ]:
+                if conditions.pollen_level_lc in _HIGH_POLLEN_LEVELS:
                     correlations.append(
                         {
                             "symptoms": matching,
@@ -360,36 +556,34 @@ class GeoExposureAgent(BaseAgent):
         symptoms: list[str],
     ) -> list[str]:
         """Generate actionable recommendations."""
-        recommendations = []
+        flags = 0
 
         # General recommendations based on conditions
         if conditions.aqi and conditions.aqi > 100:
-            recommendations.append("Keep windows closed to reduce indoor air pollution")
-            recommendations.append("Consider using an air purifier with HEPA filter")
-            recommendations.append("Limit outdoor activities, especially vigorous exercise")
-
-        if conditions.temperature_f:
-            if conditions.temperature_f >= 85:
-                recommendations.append("Ensure adequate hydration - offer water frequently")
-                recommendations.append("Schedule outdoor activities for cooler parts of the day")
-            elif conditions.temperature_f <= 40:
-                recommendations.append("Dress in warm layers for any outdoor time")
-                recommendations.append("Limit prolonged outdoor exposure")
-
-        if conditions.humidity_percent:
-            if conditions.humidity_percent < 30:
-                recommendations.append("Use a humidifier to maintain indoor humidity")
-            elif conditions.humidity_percent > 70:
-                recommendations.append("Use dehumidifier or AC to reduce humidity")
+            flags |= _REC_POOR_AIR
+
+        temp = conditions.temperature_f
+        if temp:
+            if temp >= 85:
+                flags |= _REC_HOT
+            elif temp <= 40:
+                flags |= _REC_COLD
+
+        humidity = conditions.humidity_percent
+        if humidity:
+            if humidity < 30:
+                flags |= _REC_DRY
+            elif humidity > 70:
+                flags |= _REC_HUMID
 
         # Symptom-specific recommendations
-        respiratory_symptoms = ["cough", "wheezing", "difficulty_breathing"]
-        if any(s in symptoms for s in respiratory_symptoms):
-            recommendations.append(
-                "Track when respiratory symptoms worsen relative to outdoor time"
-            )
-            recommendations.append("Consider keeping a symptom diary noting weather conditions")
+        if not _RESPIRATORY_TRACKING_SYMPTOMS.isdisjoint(symptoms):
+            flags |= _REC_RESPIRATORY
 
+        recommendations: list[str] = []
+        for flag, flag_recommendations in _RECOMMENDATIONS:
+            if flags & flag:
+                recommendations.extend(flag_recommendations)
         return recommendations
 
     def _calculate_risk_score(
@@ -398,91 +592,54 @@ class GeoExposureAgent(BaseAgent):
         alerts: list[ExposureAlert],
     ) -> float:
         """Calculate overall environmental risk score (0-1)."""
-        score = 0.0
-        factors = 0
+        return float(self._calculate_risk_scores([(conditions, alerts)])[0])
 
-        # AQI contribution
-        if conditions.aqi is not None:
-            factors += 1
-            if conditions.aqi > 200:
-                score += 0.9
-            elif conditions.aqi > 150:
-                score += 0.7
-            elif conditions.aqi > 100:
-                score += 0.5
-            elif conditions.aqi > 50:
-                score += 0.2
-            else:
-                score += 0.1
-
-        # Temperature contribution
-        if conditions.temperature_f is not None:
-            factors += 1
-            temp = conditions.temperature_f
-            if temp >= 95 or temp <= 32:
-                score += 0.7
-            elif temp >= 85 or temp <= 45:
-                score += 0.4
-            else:
-                score += 0.1
-
-        # Alert severity contribution
-        for alert in alerts:
-            if alert.severity == "severe":
-                score += 0.3
-            elif alert.severity == "high":
-                score += 0.2
-            elif alert.severity == "moderate":
-                score += 0.1
-
-        # Normalize
-        if factors > 0:
-            return min(1.0, score / factors)
-        return 0.2  # Low baseline
+    def _calculate_risk_scores(
+        self,
+        readings: list[tuple[EnvironmentalConditions, list[ExposureAlert]]],
+    ) -> np.ndarray:
+        """Risk scores (0-1) for many (conditions, alerts) readings at once."""
+        severity_counts = np.zeros((len(readings), len(Severity)))
+        for i, (_, alerts) in enumerate(readings):
+            for alert in alerts:
+                severity_counts[i, alert.severity] += 1
+
+        return calculate_risk_score_batch(
+            np.array([np.nan if c.aqi is None else c.aqi for c, _ in readings], dtype=np.float64),
+            np.array(
+                [np.nan if c.temperature_f is None else c.temperature_f for c, _ in readings],
+                dtype=np.float64,
+            ),
+            severity_counts,
+        )
+
+    def _get_aqi_info(self, aqi: float) -> tuple[str, str, str] | None:
+        """Get (category, severity, description) for an AQI value."""
+        if type(aqi) is int and 0 <= aqi <= AQI_MAX:
+            return self._AQI_LUT[aqi]
+
+        # Non-integer readings keep the range comparison
+        for low, high, info in self._AQI_BINS:
+            if aqi <= high:
+                return info if aqi >= low else None
+        return None
 
     def _get_aqi_description(self, aqi: int) -> str:
         """Get AQI description."""
-        for (low, high), (_, _, description) in self.AQI_CATEGORIES.items():
-            if low <= aqi <= high:
-                return description
-        return "Check local air quality advisories"
+        aqi_info = self._get_aqi_info(aqi)
+        return aqi_info[2] if aqi_info else "Check local air quality advisories"
 
     def _get_aqi_recommendation(self, aqi: int) -> str:
         """Get AQI-based recommendation."""
-        if aqi > 200:
-            return "Avoid all outdoor activity. Keep windows closed. Use air purifier if available."
-        elif aqi > 150:
-            return "Avoid prolonged outdoor exertion. Consider indoor activities."
-        elif aqi > 100:
-            return "Sensitive individuals should reduce prolonged outdoor activity."
-        return "Generally safe for outdoor activity."
+        return _aqi_recommendation(aqi)
 
     def _conditions_to_dict(self, conditions: EnvironmentalConditions) -> dict[str, Any]:
         """Convert conditions to dictionary."""
-        return {
-            "aqi": conditions.aqi,
-            "aqi_category": conditions.aqi_category,
-            "pm25": conditions.pm25,
-            "ozone": conditions.ozone,
-            "temperature_f": conditions.temperature_f,
-            "humidity_percent": conditions.humidity_percent,
-            "uv_index": conditions.uv_index,
-            "pollen_level": conditions.pollen_level,
-            "weather_condition": conditions.weather_condition,
-            "location": conditions.location,
-            "timestamp": conditions.timestamp.isoformat(),
-        }
-
-    def _alert_to_dict(self, alert: ExposureAlert) -> dict[str, Any]:
-        """Convert alert to dictionary."""
-        return {
-            "alert_type": alert.alert_type,
-            "severity": alert.severity,
-            "title": alert.title,
-            "description": alert.description,
-            "recommendation": alert.recommendation,
-            "related_symptoms": alert.related_symptoms,
-        }
+        conditions_dict = dict(
+            zip(_CONDITION_FIELDS, _get_condition_fields(conditions), strict=True)
+        )
+        conditions_dict["timestamp"] = conditions.timestamp.isoformat()
+        return conditions_dict
 
     def _generate_explanation(
         self,
@@ -505,16 +662,64 @@ class GeoExposureAgent(BaseAgent):
         # Alerts
         if alerts:
             lines.append("\n### Active Alerts")
-            for alert in alerts:
-                emoji = {"severe": "🔴", "high": "🟠", "moderate": "🟡", "low": "🟢"}.get(
-                    alert.severity, "⚪"
-                )
-                lines.append(f"{emoji} **{alert.title}**")
+            lines.extend(f"{_SEVERITY_EMOJI[alert.severity]} **{alert.title}**" for alert in alerts)
 
         # Correlations
         if correlations:
             lines.append("\n### Potential Environmental Correlations")
-            for corr in correlations:
-                lines.append(f"- {corr['explanation']}")
+            lines.extend(f"- {corr['explanation']}" for corr in correlations)
 
         return "\n".join(lines)
+
+
+# Risk score bands: AQI over 200/150/100/50 scores 0.9/0.7/0.5/0.2 (else 0.1);
+# temperatures at or past 95°F/32°F score 0.7, at or past 85°F/45°F 0.4 (else
+# 0.1). AQI bands use searchsorted side="left" (upper bounds inclusive);
+# temperature bands use side="right" with nextafter so 32°F and 45°F fall in
+# the cold bands.
+_AQI_SCORE_CUTOFFS = np.array([50.0, 100.0, 150.0, 200.0])
+_AQI_SCORES = np.array([0.1, 0.2, 0.5, 0.7, 0.9])
+_TEMP_SCORE_CUTOFFS = np.array(
+    [math.nextafter(32.0, math.inf), math.nextafter(45.0, math.inf), 85.0, 95.0]
+)
+_TEMP_SCORES = np.array([0.7, 0.4, 0.1, 0.4, 0.7])
+# Per-alert contribution, indexed by Severity
+_ALERT_SEVERITY_SCORES = np.array(_SEVERITY_WEIGHTS)
+
+
+def calculate_risk_score_batch(
+    aqis: np.ndarray,
+    temps: np.ndarray,
+    severity_counts: np.ndarray,
+) -> np.ndarray:
+    """
+    Environmental risk score (0-1) for many readings, the one implementation
+    behind GeoExposureAgent._calculate_risk_score and process_batch. Each
+    measured factor adds its band score and each alert its severity weight;
+    the total is averaged over the measured factors.
+
+    Args:
+        aqis: AQI per reading (NaN when missing)
+        temps: Temperature in °F per reading (NaN when missing)
+        severity_counts: (n, len(Severity)) alert counts, indexed by Severity
+
+    Returns:
+        Risk score (0-1) per reading
+    """
+    aqis = np.asarray(aqis, dtype=np.float64)
+    temps = np.asarray(temps, dtype=np.float64)
+
+    has_aqi = ~np.isnan(aqis)
+    has_temp = ~np.isnan(temps)
+
+    total = np.where(has_aqi, _AQI_SCORES[np.searchsorted(_AQI_SCORE_CUTOFFS, aqis)], 0.0)
+    total += np.where(
+        has_temp, _TEMP_SCORES[np.searchsorted(_TEMP_SCORE_CUTOFFS, temps, side="right")], 0.0
+    )
+    total += np.asarray(severity_counts, dtype=np.float64) @ _ALERT_SEVERITY_SCORES
+
+    factors = has_aqi.astype(np.float64) + has_temp
+    scores = np.full(total.shape, 0.2)  # Low baseline when nothing was measured
+    np.divide(total, factors, out=scores, where=factors > 0)
+    np.minimum(scores, 1.0, out=scores, where=factors > 0)
+    return scores
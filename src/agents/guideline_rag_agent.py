@@ -11,17 +11,29 @@ Retrieval-Augmented Generation for clinical guidelines:
 This agent provides educational information, NOT medical advice.
 """
 
+import heapq
+import inspect
 import logging
+import math
 import re
-from dataclasses import dataclass
-from typing import Any
-
+import secrets
+import sys
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, ClassVar, Final
+
+import numpy as np
+
+from .. import RISK_CRITICAL, RISK_HIGH, RISK_LOW, RISK_TIERS
 from .base_agent import AgentConfig, AgentResponse, BaseAgent
 
 logger = logging.getLogger("epcid.agents.guideline_rag")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GuidelineSource:
     """A source for clinical guidelines."""
 
@@ -32,7 +44,7 @@ class GuidelineSource:
     category: str  # "government", "academic", "professional"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GuidelineResult:
     """A retrieved guideline result."""
 
@@ -43,6 +55,42 @@ class GuidelineResult:
     age_appropriate: bool
     citation: str
     url: str | None = None
+    # Truncated content for response data and text; derived from content
+    # when not supplied
+    summary: str | None = field(default=None, repr=False)
+    excerpt: str | None = field(default=None, repr=False)
+
+
+@dataclass(slots=True, frozen=True)
+class _PreparedTemplate:
+    """Per-template result fields that do not depend on the request."""
+
+    title: str
+    content: str
+    source: GuidelineSource
+    citation: str
+    summary: str
+    excerpt: str
+
+
+# Content lengths for guideline dicts (summary) and response text (excerpt)
+SUMMARY_LENGTH = 300
+EXCERPT_LENGTH = 500
+
+# How far a term's best guideline must outscore its runner-up for the term
+# to retrieve it. Words mentioned about equally in several guidelines (e.g.
+# "home" in each "Home care" list) land within 10% of each other, while a
+# term's own topic leads passing mentions by 1.4x or more.
+RANK_MARGIN = 1.25
+# Relevance floors when a search term names a template's topic key, or when
+# one contains the other (e.g. "difficulty breathing" and "breathing")
+EXACT_KEY_RELEVANCE = 0.9
+PARTIAL_KEY_RELEVANCE = 0.7
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to ``limit`` characters, marking the cut with an ellipsis."""
+    return text[:limit] + "..." if len(text) > limit else text
 
 
 # Allowlisted sources
@@ -85,6 +133,238 @@ ALLOWED_SOURCES = [
 ]
 
 
+# Age bucket upper bounds (months), aligned with pediatric vital sign bands
+AGE_BUCKETS = (3, 6, 12, 36, 72, 216)
+
+
+def age_bucket(age_months: int | float | None) -> int:
+    """Map an age in months to a coarse bucket index (-1 if unknown)."""
+    if age_months is None:
+        return -1
+    for i, upper in enumerate(AGE_BUCKETS):
+        if age_months < upper:
+            return i
+    return len(AGE_BUCKETS)
+
+
+class GuidelineCache:
+    """
+    In-process LRU cache for guideline retrievals.
+
+    GuidelineRAGAgent keys it by normalized request (see _retrieval_key), so
+    equivalent requests from different caregiver sessions share an entry.
+    Entries expire after ``ttl_seconds`` so guideline updates propagate.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 3600) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple) -> Any | None:
+        """Get a cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Tokenizer patterns. Neither nests quantifiers, so the stdlib engine scans
+# in time linear in the text; maximal \w+ runs are already word-bounded
+_TOKEN_RE = re.compile(r"[a-z]{3,}")
+_WORD_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of three or more letters."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _retrieval_key(search_terms: list[str], age_months: int | float | None) -> tuple:
+    """
+    Key requests by their search terms and the age bucket, which is
+    everything retrieval reads. The terms are kept whole rather than reduced
+    to index tokens, since the topic-key floors match against the raw terms
+    (e.g. "rash 2" and "rash" score differently).
+    """
+    return tuple(sorted(search_terms)), age_bucket(age_months)
+
+
+# (data, confidence, explanation) for a request, shared by equivalent requests
+_BuiltResult = tuple[dict[str, Any], float, str]
+# (search_terms, risk_tier, query, age_months, cache_key)
+_ParsedRequest = tuple[list[str], str, str, int | None, tuple]
+
+
+# Tiers whose responses carry escalation language
+_ESCALATING_TIERS: Final = frozenset({RISK_CRITICAL, RISK_HIGH})
+
+# Fixed parts of the response text and explanation
+_NO_RESULTS_TEXT = (
+    "I couldn't find specific guidelines matching your query. "
+    "For medical concerns, please consult with your pediatrician."
+)
+_RESPONSE_HEADER = (
+    "**📚 Educational Information**\n"
+    "*This information is for educational purposes only and does not constitute medical advice.*\n"
+)
+_EXPLANATION_DISCLAIMERS = (
+    "\n### Disclaimers Applied\n"
+    "- All content from allowlisted sources only\n"
+    "- Citations included for all information\n"
+    "- No treatment instructions provided"
+)
+
+
+def _clean_templates(templates: dict[str, dict[str, str]]) -> None:
+    """
+    Strip the source-code indentation from template content once at load,
+    so it does not reach responses (where it would render as code blocks)
+    or the truncated excerpts. Topic keys, titles and source ids are
+    interned, so lookups against them and the dicts built from them share
+    one string object each.
+    """
+    for key in list(templates):
+        template = templates.pop(key)
+        template["title"] = sys.intern(template["title"])
+        template["source_id"] = sys.intern(template["source_id"])
+        template["content"] = inspect.cleandoc(template["content"])
+        templates[sys.intern(key)] = template
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index of the guideline corpus.
+
+    Each posting carries its precomputed BM25 weight, so a query only sums
+    the postings of its own tokens. Each search term is scored separately
+    and normalized by its best attainable score (every token saturated), so
+    relevance stays in [0, 1]. A term only retrieves the document it ranks
+    first, and only when that document leads the runner-up by
+    ``rank_margin``; a document keeps its best score over such terms.
+    Tokens found in half the documents or more are not indexed for search.
+    """
+
+    def __init__(
+        self,
+        documents: dict[str, str],
+        k1: float = 1.5,
+        b: float = 0.75,
+        rank_margin: float = RANK_MARGIN,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.rank_margin = rank_margin
+        self.keys = list(documents)
+        tokenized = [_tokenize(text) for text in documents.values()]
+        lengths = [len(tokens) for tokens in tokenized]
+        self.avgdl = sum(lengths) / len(lengths) if lengths else 0.0
+
+        # term -> [(document, term frequency)]
+        frequencies: dict[str, list[tuple[int, int]]] = {}
+        for doc, tokens in enumerate(tokenized):
+            for term, tf in Counter(tokens).items():
+                frequencies.setdefault(term, []).append((doc, tf))
+
+        n = len(self.keys)
+        self.idf = {
+            term: math.log((n - len(postings) + 0.5) / (len(postings) + 0.5) + 1)
+            for term, postings in frequencies.items()
+        }
+
+        # term -> [(document, BM25 weight)], plus the term's saturated weight.
+        # Tokens in half the corpus or more do not discriminate (their
+        # classic RSJ IDF is not positive) and are left out.
+        self.postings: dict[str, list[tuple[int, float]]] = {}
+        self.max_weights: dict[str, float] = {}
+        for term, postings in frequencies.items():
+            if 2 * len(postings) >= n:
+                continue
+            idf = self.idf[term]
+            self.postings[term] = [
+                (doc, idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc] / self.avgdl)))
+                for doc, tf in postings
+            ]
+            self.max_weights[term] = idf * (k1 + 1)
+
+    def search(self, terms: list[str]) -> dict[str, float]:
+        """Return {key: normalized BM25 score} for documents singled out by a term."""
+        return {self.keys[doc]: score for doc, score in self._best_scores(terms).items()}
+
+    def scores(self, terms: list[str]) -> np.ndarray:
+        """Normalized BM25 score of every document, in key order (0 if unmatched)."""
+        out = np.zeros(len(self.keys))
+        for doc, score in self._best_scores(terms).items():
+            out[doc] = score
+        return out
+
+    def _best_scores(self, terms: list[str]) -> dict[int, float]:
+        """Best normalized score by document position, over the terms ranking it first."""
+        best: dict[int, float] = {}
+
+        for term in terms:
+            scores: dict[int, float] = {}
+            max_score = 0.0
+            for token in dict.fromkeys(_tokenize(term)):
+                postings = self.postings.get(token)
+                if postings is None:
+                    continue
+                max_score += self.max_weights[token]
+                for doc, weight in postings:
+                    scores[doc] = scores.get(doc, 0.0) + weight
+
+            if not scores:
+                continue
+            ranked = heapq.nlargest(2, scores.items(), key=lambda item: item[1])
+            doc, score = ranked[0]
+            if len(ranked) > 1 and score < self.rank_margin * ranked[1][1]:
+                continue
+            normalized = score / max_score
+            if normalized > best.get(doc, 0.0):
+                best[doc] = normalized
+
+        return best
+
+
 class GuidelineRAGAgent(BaseAgent):
     """
     RAG agent for retrieving clinical guidelines and educational content.
@@ -96,6 +376,9 @@ class GuidelineRAGAgent(BaseAgent):
     - Uses escalation language for high-risk situations
     """
 
+    # Corpus index, built on first use by _get_bm25_index
+    _bm25_index: ClassVar[BM25Index]
+
     # Educational content templates (simulating knowledge base)
     CONTENT_TEMPLATES = {
         "fever": {
@@ -229,6 +512,7 @@ class GuidelineRAGAgent(BaseAgent):
             "source_id": "cdc",
         },
     }
+    _clean_templates(CONTENT_TEMPLATES)
 
     # Escalation messages
     ESCALATION_MESSAGES = {
@@ -253,16 +537,85 @@ class GuidelineRAGAgent(BaseAgent):
             custom_config={
                 "require_citation": True,
                 "no_treatment_instructions": True,
+                "retrieval_cache_size": 2048,
+                "retrieval_cache_ttl_seconds": 3600,
             },
         )
         super().__init__(config, **kwargs)
 
         self.sources = {s.id: s for s in ALLOWED_SOURCES}
+        # Prepared templates by document position in the index, so ranking
+        # works on score arrays and only reads records above the threshold
+        self.prepared = self._prepare_templates()
+        self.template_keys = tuple(self.CONTENT_TEMPLATES)
+        # Citation entry per template citation string, for _extract_citations
+        self.citation_records = {
+            template.citation: {
+                "source": template.source.name,
+                "title": template.title,
+                "url": template.source.url or "",
+                "trust_level": template.source.trust_level,
+            }
+            for template in self.prepared
+            if template is not None
+        }
+        # (escalation message, escalation language applies) per known tier
+        self.tier_escalation = {tier: self._resolve_escalation(tier) for tier in RISK_TIERS}
+        # No-results response per known tier, for requests without search terms
+        self.empty_results = {tier: self._render_result([], [], tier, "") for tier in RISK_TIERS}
+        self.bm25_index = self._get_bm25_index()
+        # Retrieval results by normalized request (see process); the TTL lets
+        # guideline updates propagate, and a size of 0 disables caching
+        self.retrieval_cache = GuidelineCache(
+            maxsize=self.get_config_value("retrieval_cache_size", 2048),
+            ttl_seconds=self.get_config_value("retrieval_cache_ttl_seconds", 3600),
+        )
+
+    def _prepare_templates(self) -> tuple[_PreparedTemplate | None, ...]:
+        """
+        Resolve sources, citations and truncated content once per template, in
+        corpus order. Templates without an allowlisted source are None.
+        """
+        prepared: list[_PreparedTemplate | None] = []
+        for template in self.CONTENT_TEMPLATES.values():
+            source = self.sources.get(template["source_id"])
+            if source:
+                title, content = template["title"], template["content"]
+                prepared.append(
+                    _PreparedTemplate(
+                        title=title,
+                        content=content,
+                        source=source,
+                        citation=f"{source.name}. {title}. {source.url}",
+                        summary=_truncate(content, SUMMARY_LENGTH),
+                        excerpt=_truncate(content, EXCERPT_LENGTH),
+                    )
+                )
+            else:
+                prepared.append(None)
+        return tuple(prepared)
+
+    @classmethod
+    def _get_bm25_index(cls) -> BM25Index:
+        """Build the BM25 inverted index once per class and share it across instances."""
+        index = cls.__dict__.get("_bm25_index")
+        if index is None:
+            index = BM25Index(cls._corpus_documents())
+            cls._bm25_index = index
+        return index
+
+    @classmethod
+    def _corpus_documents(cls) -> dict[str, str]:
+        """Indexed text per template: topic key, title and content."""
+        return {
+            key: f"{key} {template['title']} {template['content']}"
+            for key, template in cls.CONTENT_TEMPLATES.items()
+        }
 
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Retrieve relevant guidelines for the given query/symptoms.
@@ -274,25 +627,144 @@ class GuidelineRAGAgent(BaseAgent):
         Returns:
             AgentResponse with guidelines and citations
         """
-        import uuid
+        request = self._parse_request(input_data, context)
+        search_terms, risk_tier, query, age_months, cache_key = request
+
+        # Nothing to search for: answer with the prebuilt no-results response
+        if not search_terms:
+            return self._respond(self._empty_result(risk_tier), search_terms)
+
+        cached: _BuiltResult | None = self.retrieval_cache.get(cache_key)
+        if cached is None:
+            cached = self._build_result(search_terms, risk_tier, query, age_months)
+            self.retrieval_cache.set(cache_key, cached)
+
+        return self._respond(cached, search_terms)
+
+    async def process_batch(
+        self,
+        inputs: list[dict[str, Any]],
+        context: Mapping[str, Any] | None = None,
+    ) -> list[AgentResponse]:
+        """
+        Retrieve guidelines for many queries at once.
+
+        Equivalent requests share one cached result, and retrieval runs once
+        per distinct set of search terms in the batch; only tier-specific text
+        is generated per request.
+
+        Args:
+            inputs: Input dicts, as accepted by process
+            context: Shared context, e.g. a default risk tier
+
+        Returns:
+            AgentResponses in the same order as inputs
+        """
+        requests = [self._parse_request(input_data, context) for input_data in inputs]
+
+        built: dict[tuple, _BuiltResult] = {}
+        misses: dict[tuple, _ParsedRequest] = {}
+        for request in requests:
+            cache_key = request[4]
+            if cache_key in built or cache_key in misses:
+                continue
+            if not request[0]:
+                built[cache_key] = self._empty_result(request[1])
+                continue
+            cached = self.retrieval_cache.get(cache_key)
+            if cached is None:
+                misses[cache_key] = request
+            else:
+                built[cache_key] = cached
+
+        if misses:
+            results = self._build_results(list(misses.values()))
+            for cache_key, result in zip(misses, results, strict=True):
+                self.retrieval_cache.set(cache_key, result)
+                built[cache_key] = result
 
-        request_id = str(uuid.uuid4())[:12]
+        return [self._respond(built[request[4]], request[0]) for request in requests]
 
+    def _parse_request(
+        self,
+        input_data: dict[str, Any],
+        context: Mapping[str, Any] | None,
+    ) -> _ParsedRequest:
+        """Read a request. Returns (search_terms, risk_tier, query, age_months, cache_key)."""
         # Extract query
         query = input_data.get("query", "")
         symptoms = input_data.get("symptoms", [])
-        risk_tier = input_data.get("risk_tier") or (context or {}).get("risk_tier", "LOW")
+        # Tiers are upper-case constants; other spellings are folded once here
+        risk_tier = (
+            input_data.get("risk_tier") or (context or {}).get("risk_tier") or RISK_LOW
+        ).upper()
         age_months = input_data.get("demographics", {}).get("age_months")
 
         # Build search terms
         search_terms = self._extract_search_terms(query, symptoms)
 
-        # Retrieve relevant guidelines
-        results = self._retrieve_guidelines(search_terms, age_months)
+        # Requests with the same search terms, risk tier and age bucket
+        # retrieve the same guidelines and reuse the cached result
+        cache_key = (_retrieval_key(search_terms, age_months), risk_tier)
+        return search_terms, risk_tier, query, age_months, cache_key
+
+    def _respond(self, built: _BuiltResult, search_terms: list[str]) -> AgentResponse:
+        """Wrap a (possibly shared) built result in a response of its own."""
+        request_id = secrets.token_hex(6)
+        data, confidence, explanation = built
+
+        return self.create_response(
+            request_id=request_id,
+            data={
+                **data,
+                "guidelines": [dict(g) for g in data["guidelines"]],
+                "citations": [dict(c) for c in data["citations"]],
+                "search_terms": search_terms,
+            },
+            confidence=confidence,
+            explanation=explanation,
+        )
 
-        # Filter and rank results
-        filtered_results = self._filter_results(results, age_months)
+    def _empty_result(self, risk_tier: str) -> _BuiltResult:
+        """No-results response for a tier, rendered on demand for unusual spellings."""
+        built = self.empty_results.get(risk_tier)
+        if built is None:
+            built = self._render_result([], [], risk_tier, "")
+        return built
+
+    def _build_results(self, requests: list[_ParsedRequest]) -> list[_BuiltResult]:
+        """Build results for several requests, retrieving once per search-term set."""
+        retrieved: dict[tuple, list[GuidelineResult]] = {}
+        built = []
+        for search_terms, risk_tier, query, age_months, cache_key in requests:
+            retrieval_key = cache_key[0]
+            results = retrieved.get(retrieval_key)
+            if results is None:
+                results = self._retrieve_guidelines(search_terms, age_months)
+                retrieved[retrieval_key] = results
+            built.append(self._render_result(results, search_terms, risk_tier, query))
+        return built
+
+    def _build_result(
+        self,
+        search_terms: list[str],
+        risk_tier: str,
+        query: str,
+        age_months: int | None,
+    ) -> _BuiltResult:
+        """Run retrieval for a request. Returns (data, confidence, explanation)."""
+        # Retrieve, deduplicate and rank relevant guidelines
+        filtered_results = self._retrieve_guidelines(search_terms, age_months)
+        return self._render_result(filtered_results, search_terms, risk_tier, query)
 
+    def _render_result(
+        self,
+        filtered_results: list[GuidelineResult],
+        search_terms: list[str],
+        risk_tier: str,
+        query: str,
+    ) -> _BuiltResult:
+        """Generate text and citations for retrieved guidelines at a risk tier."""
         # Generate response with citations
         response_text = self._generate_response(
             filtered_results,
@@ -301,23 +773,23 @@ class GuidelineRAGAgent(BaseAgent):
         )
 
         # Add escalation message if needed
-        escalation_message = self._get_escalation_message(risk_tier)
+        escalation_message, escalates = self._tier_escalation(risk_tier)
 
         # Extract all citations
         citations = self._extract_citations(filtered_results)
 
-        return self.create_response(
-            request_id=request_id,
-            data={
-                "guidelines": [self._result_to_dict(r) for r in filtered_results],
-                "response_text": response_text,
-                "escalation_message": escalation_message,
-                "citations": citations,
-                "search_terms": search_terms,
-                "result_count": len(filtered_results),
-            },
-            confidence=0.85 if filtered_results else 0.5,
-            explanation=self._generate_explanation(filtered_results, risk_tier),
+        data = {
+            "guidelines": [self._result_to_dict(r) for r in filtered_results],
+            "response_text": response_text,
+            "escalation_message": escalation_message,
+            "citations": citations,
+            "search_terms": search_terms,
+            "result_count": len(filtered_results),
+        }
+        return (
+            data,
+            0.85 if filtered_results else 0.5,
+            self._generate_explanation(filtered_results, risk_tier, escalates),
         )
 
     def _extract_search_terms(
@@ -328,76 +800,73 @@ class GuidelineRAGAgent(BaseAgent):
         """Extract search terms from query and symptoms."""
         terms = []
 
-        # Add symptoms
+        # Add symptoms, mapping caregiver phrasings to symptom terms
         for symptom in symptoms:
-            normalized = symptom.lower().replace("_", " ")
-            terms.append(normalized)
+            terms.append(normalize_symptom_query(symptom.replace("_", " ")))
 
         # Extract keywords from query
         if query:
-            # Simple keyword extraction
-            words = re.findall(r"\b\w+\b", query.lower())
-            medical_terms = [w for w in words if len(w) > 3]
-            terms.extend(medical_terms[:5])
+            lower = query.lower()
+            # Simple keyword extraction (first five words over three letters)
+            words = _WORD_RE.findall(lower)
+            terms.extend(islice((w for w in words if len(w) > 3), 5))
+            # Caregiver phrasings anywhere in the query, found in one scan
+            terms.extend(_SYMPTOM_MAP[phrase] for phrase in _SYMPTOM_PHRASE_RE.findall(lower))
 
-        return list(set(terms))
+        return list(dict.fromkeys(terms))
 
     def _retrieve_guidelines(
         self,
         search_terms: list[str],
         age_months: int | None,
     ) -> list[GuidelineResult]:
-        """Retrieve guidelines matching search terms."""
-        results = []
-
-        for term in search_terms:
-            # Check for matching content
-            for key, template in self.CONTENT_TEMPLATES.items():
-                if term in key or key in term:
-                    source = self.sources.get(template["source_id"])
-                    if source:
-                        result = GuidelineResult(
-                            title=template["title"],
-                            content=template["content"],
-                            source=source,
-                            relevance_score=0.9 if term == key else 0.7,
-                            age_appropriate=True,  # Would check in production
-                            citation=f"{source.name}. {template['title']}. {source.url}",
-                            url=source.url,
-                        )
-                        results.append(result)
-
-        # Sort by relevance
-        results.sort(key=lambda r: r.relevance_score, reverse=True)
-
-        return results
-
-    def _filter_results(
-        self,
-        results: list[GuidelineResult],
-        age_months: int | None,
-    ) -> list[GuidelineResult]:
-        """Filter and deduplicate results."""
-        seen_titles = set()
-        filtered = []
-
-        for result in results:
-            # Skip duplicates
-            if result.title in seen_titles:
+        """Retrieve the top guidelines for the search terms, one per title."""
+        # Each template scores its best BM25 relevance to a term that ranks it
+        # first (see BM25Index)
+        relevance = self.bm25_index.scores(search_terms)
+
+        # A term naming a template's topic always retrieves it
+        for doc, key in enumerate(self.template_keys):
+            if key in search_terms:
+                floor = EXACT_KEY_RELEVANCE
+            elif any(term in key or key in term for term in search_terms):
+                floor = PARTIAL_KEY_RELEVANCE
+            else:
                 continue
-            seen_titles.add(result.title)
-
-            # Skip low relevance
-            if result.relevance_score < 0.5:
+            relevance[doc] = max(relevance[doc], floor)
+
+        # Skip unretrieved templates, and deduplicate by title keeping the most
+        # relevant
+        prepared = self.prepared
+        best_per_title: dict[str, tuple[int, _PreparedTemplate]] = {}
+        for doc in np.flatnonzero(relevance).tolist():
+            template = prepared[doc]
+            if template is None:
                 continue
-
-            # Check age appropriateness (placeholder)
-            # In production, would filter infant-specific content for older children, etc.
-
-            filtered.append(result)
-
-        # Limit to top 5
-        return filtered[:5]
+            current = best_per_title.get(template.title)
+            if current is None or relevance[doc] > relevance[current[0]]:
+                best_per_title[template.title] = (doc, template)
+
+        # Top 5 by relevance; only these are materialized
+        top = heapq.nlargest(5, best_per_title.values(), key=lambda item: relevance[item[0]])
+
+        # Check age appropriateness (placeholder)
+        # In production, would filter infant-specific content for older children, etc.
+        results = [
+            GuidelineResult(
+                title=template.title,
+                content=template.content,
+                source=template.source,
+                relevance_score=float(relevance[doc]),
+                age_appropriate=True,  # Would check in production
+                citation=template.citation,
+                url=template.source.url,
+                summary=template.summary,
+                excerpt=template.excerpt,
+            )
+            for doc, template in top
+        ]
+        return results
 
     def _generate_response(
         self,
@@ -407,45 +876,51 @@ class GuidelineRAGAgent(BaseAgent):
     ) -> str:
         """Generate response text from guidelines."""
         if not results:
-            return (
-                "I couldn't find specific guidelines matching your query. "
-                "For medical concerns, please consult with your pediatrician."
-            )
+            return _NO_RESULTS_TEXT
 
-        lines = []
-
-        # Add main disclaimer
-        lines.append(
-            "**📚 Educational Information**\n"
-            "*This information is for educational purposes only and does not constitute medical advice.*\n"
-        )
-
-        # Add content from top results
-        for _i, result in enumerate(results[:3]):
-            lines.append(f"### {result.title}")
-
-            # Truncate content
-            content = result.content
-            if len(content) > 500:
-                content = content[:500] + "..."
-
-            lines.append(content)
-            lines.append(f"\n*Source: {result.citation}*\n")
-
-        return "\n".join(lines)
+        # One section per top result: title, truncated content and citation
+        sections = [
+            f"### {result.title}\n"
+            f"{result.excerpt if result.excerpt is not None else _truncate(result.content, EXCERPT_LENGTH)}\n"
+            f"\n*Source: {result.citation}*\n"
+            for result in results[:3]
+        ]
+        return "\n".join([_RESPONSE_HEADER, *sections])
 
     def _get_escalation_message(self, risk_tier: str) -> str | None:
         """Get appropriate escalation message for risk tier."""
-        tier_lower = risk_tier.lower()
-        return self.ESCALATION_MESSAGES.get(tier_lower)
+        return self._tier_escalation(risk_tier)[0]
+
+    def _tier_escalation(self, risk_tier: str) -> tuple[str | None, bool]:
+        """Look up a tier's escalation text, resolving unusual spellings on demand."""
+        escalation = self.tier_escalation.get(risk_tier)
+        if escalation is None:
+            escalation = self._resolve_escalation(risk_tier)
+        return escalation
+
+    def _resolve_escalation(self, risk_tier: str) -> tuple[str | None, bool]:
+        """Escalation message and whether escalation language applies for a tier."""
+        return (
+            self.ESCALATION_MESSAGES.get(risk_tier.lower()),
+            risk_tier.upper() in _ESCALATING_TIERS,
+        )
 
     def _extract_citations(self, results: list[GuidelineResult]) -> list[dict[str, str]]:
         """Extract citations from results."""
+        records = self.citation_records
         citations = []
         seen = set()
 
         for result in results:
-            if result.citation not in seen:
+            if result.citation in seen:
+                continue
+            seen.add(result.citation)
+
+            # Copy the prepared entry; build one for results from elsewhere
+            record = records.get(result.citation)
+            if record is not None:
+                citations.append(record.copy())
+            else:
                 citations.append(
                     {
                         "source": result.source.name,
@@ -454,7 +929,6 @@ class GuidelineRAGAgent(BaseAgent):
                         "trust_level": result.source.trust_level,
                     }
                 )
-                seen.add(result.citation)
 
         return citations
 
@@ -463,7 +937,9 @@ class GuidelineRAGAgent(BaseAgent):
         return {
             "title": result.title,
             "content": (
-                result.content[:300] + "..." if len(result.content) > 300 else result.content
+                result.summary
+                if result.summary is not None
+                else _truncate(result.content, SUMMARY_LENGTH)
             ),
             "source": result.source.name,
             "relevance_score": result.relevance_score,
@@ -475,25 +951,25 @@ class GuidelineRAGAgent(BaseAgent):
         self,
         results: list[GuidelineResult],
         risk_tier: str,
+        escalates: bool | None = None,
     ) -> str:
-        """Generate explanation of the retrieval process."""
-        lines = ["## Guideline Retrieval\n"]
-
-        lines.append(f"**Results Found:** {len(results)}")
-        lines.append(f"**Risk Context:** {risk_tier}")
+        """
+        Generate explanation of the retrieval process. ``escalates`` says whether
+        escalation language applies, looked up from the tier when not given.
+        """
+        lines = [
+            f"## Guideline Retrieval\n\n**Results Found:** {len(results)}\n**Risk Context:** {risk_tier}"
+        ]
 
         if results:
             lines.append("\n### Sources Used")
-            sources = {r.source.name for r in results}
-            for source in sources:
-                lines.append(f"- {source}")
+            lines.extend(f"- {name}" for name in dict.fromkeys(r.source.name for r in results))
 
-        lines.append("\n### Disclaimers Applied")
-        lines.append("- All content from allowlisted sources only")
-        lines.append("- Citations included for all information")
-        lines.append("- No treatment instructions provided")
+        lines.append(_EXPLANATION_DISCLAIMERS)
 
-        if risk_tier.upper() in ["CRITICAL", "HIGH"]:
+        if escalates is None:
+            escalates = self._tier_escalation(risk_tier)[1]
+        if escalates:
             lines.append("- Escalation language included")
 
         return "\n".join(lines)
@@ -502,20 +978,30 @@ class GuidelineRAGAgent(BaseAgent):
 # Query preprocessing utilities
 
 
+# Common caregiver phrasings mapped to indexed symptom terms
+_SYMPTOM_MAP: Final[dict[str, str]] = {
+    "high temperature": "fever",
+    "high fever": "fever",
+    "throwing up": "vomiting",
+    "puking": "vomiting",
+    "skin rash": "rash",
+    "hard to breathe": "breathing",
+    "trouble breathing": "breathing",
+    "can't breathe": "breathing",
+    "runny poop": "diarrhea",
+}
+
+
+# All phrasings in one alternation, longest first so overlapping phrases
+# ("high fever" vs a shorter prefix) match in full
+_SYMPTOM_PHRASE_RE = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(phrase) for phrase in sorted(_SYMPTOM_MAP, key=len, reverse=True))
+    + r")\b"
+)
+
+
 def normalize_symptom_query(symptom: str) -> str:
     """Normalize a symptom for searching."""
-    # Map common variations
-    mappings = {
-        "high temperature": "fever",
-        "high fever": "fever",
-        "throwing up": "vomiting",
-        "puking": "vomiting",
-        "skin rash": "rash",
-        "hard to breathe": "breathing",
-        "trouble breathing": "breathing",
-        "can't breathe": "breathing",
-        "runny poop": "diarrhea",
-    }
-
     lower = symptom.lower().strip()
-    return mappings.get(lower, lower)
+    return _SYMPTOM_MAP.get(lower, lower)
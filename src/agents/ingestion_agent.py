@@ -15,6 +15,7 @@ Ensures all data is timestamped, validated, and ready for processing.
 import base64
 import logging
 import re
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -188,7 +189,7 @@ class IngestionAgent(BaseAgent):
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Process and normalize input data.
@@ -14,6 +14,7 @@ This is NOT prescriptive - purely informational.
 """
 
 import logging
+from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Any
 
@@ -175,7 +176,7 @@ class MedicationSafetyAgent(BaseAgent):
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Check medications against symptoms for potential adverse events.
@@ -15,6 +15,7 @@ These derived signals enable better risk stratification.
 """
 
 import logging
+from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Any
 
@@ -105,7 +106,7 @@ class PhenotypeAgent(BaseAgent):
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Process normalized data and compute phenotypes.
@@ -487,7 +488,7 @@ class PhenotypeAgent(BaseAgent):
     def _compute_appetite_phenotype(
         self,
         symptoms: list[str],
-        context: dict[str, Any] | None,
+        context: Mapping[str, Any] | None,
     ) -> Phenotype | None:
         """Compute appetite/feeding phenotype."""
         score = 100  # Start at 100% normal
@@ -597,7 +598,7 @@ class PhenotypeAgent(BaseAgent):
     def _compute_pain_phenotype(
         self,
         symptoms: list[str],
-        context: dict[str, Any] | None,
+        context: Mapping[str, Any] | None,
     ) -> Phenotype | None:
         """Compute pain phenotype."""
         pain_symptoms = {
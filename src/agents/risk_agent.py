@@ -18,7 +18,7 @@ Clinical References:
 """
 
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, cast
@@ -53,6 +53,12 @@ except ImportError:
 
 logger = logging.getLogger("epcid.agents.risk")
 
+# Risk tier ordering (lower = more severe)
+RISK_TIER_PRIORITY = {RISK_CRITICAL: 0, RISK_HIGH: 1, RISK_MODERATE: 2, RISK_LOW: 3}
+
+# Points a triggered clinical rule contributes, by rule risk tier
+RULE_TIER_POINTS = {RISK_CRITICAL: 4, RISK_HIGH: 3, RISK_MODERATE: 2}
+
 
 class RuleType(Enum):
     """Types of risk rules."""
@@ -93,6 +99,7 @@ class RiskScore:
     confidence: float
     explanation: str
     contributing_factors: list[str] = field(default_factory=list)
+    rules_mask: int = 0  # Bit per triggered rule, see RiskAgent.rules_from_mask
 
 
 class RiskAgent(BaseAgent):
@@ -127,6 +134,10 @@ class RiskAgent(BaseAgent):
 
         self.enable_ml = enable_ml
         self.enable_clinical_scoring = enable_clinical_scoring and CLINICAL_SCORING_AVAILABLE
+        self._rule_ids: tuple[str, ...] = ()
+        self._safety_rules: tuple[tuple[RiskRule, int], ...] = ()
+        self._clinical_rules: tuple[tuple[RiskRule, int, int], ...] = ()
+        self._clinical_max_points = 0
         self.rules = self._initialize_rules()
 
         # Initialize clinical scoring calculators
@@ -144,10 +155,50 @@ class RiskAgent(BaseAgent):
         elif not CLINICAL_SCORING_AVAILABLE:
             logger.warning("Clinical scoring modules not available")
 
+    @property
+    def rules(self) -> tuple[RiskRule, ...]:
+        """Get the active rule set; assign a new sequence to change it."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: Iterable[RiskRule]) -> None:
+        """Replace the rule set and recompile the per-layer evaluation plan."""
+        # Stored as a tuple so in-place edits fail instead of being ignored
+        self._rules = tuple(rules)
+        self._compile_rules()
+
+    def _compile_rules(self) -> None:
+        """
+        Partition rules by layer once so evaluation does no filtering,
+        sorting, or tier-to-points lookups per request.
+
+        Each rule gets a stable bit (its position in the rule set) so
+        triggered rules are collected as an int mask and only resolved to
+        ids when needed.
+        """
+        self._rule_ids = tuple(r.id for r in self._rules)
+        bits = [(r, 1 << i) for i, r in enumerate(self._rules)]
+        self._safety_rules = tuple(
+            sorted(
+                ((r, bit) for r, bit in bits if r.rule_type == RuleType.SAFETY),
+                key=lambda entry: entry[0].priority,
+            )
+        )
+        self._clinical_rules = tuple(
+            (r, RULE_TIER_POINTS.get(r.risk_tier, 1), bit)
+            for r, bit in bits
+            if r.rule_type == RuleType.CLINICAL
+        )
+        self._clinical_max_points = len(self._clinical_rules) * 2
+
+    def rules_from_mask(self, mask: int) -> list[str]:
+        """Resolve a triggered-rules mask to rule ids, in rule set order."""
+        return [rule_id for i, rule_id in enumerate(self._rule_ids) if mask >> i & 1]
+
     async def process(
         self,
         input_data: dict[str, Any],
-        context: dict[str, Any] | None = None,
+        context: Mapping[str, Any] | None = None,
     ) -> AgentResponse:
         """
         Perform risk assessment on input data.
@@ -235,6 +286,9 @@ class RiskAgent(BaseAgent):
                 **{s.source: s.score for s in ml_scores},
             },
             "triggered_rules": final_result["triggered_rules"],
+            # Individual clinical rules that fired (see rules_from_mask); unlike
+            # triggered_rules above, which names the scoring sources.
+            "clinical_rules_mask": clinical_scores[0].rules_mask if clinical_scores else 0,
             "risk_factors": final_result["risk_factors"],
             "protective_factors": final_result.get("protective_factors", []),
             "uncertainty_factors": final_result.get("uncertainty_factors", []),
@@ -606,17 +660,14 @@ class RiskAgent(BaseAgent):
 
     def _evaluate_safety_rules(self, context: dict[str, Any]) -> dict[str, Any]:
         """Evaluate safety rules for immediate override."""
-        triggered_rules = []
+        mask = 0
         messages = []
         max_risk = None
 
-        safety_rules = [r for r in self.rules if r.rule_type == RuleType.SAFETY]
-        safety_rules.sort(key=lambda r: r.priority)
-
-        for rule in safety_rules:
+        for rule, bit in self._safety_rules:
             triggered, message = rule.evaluate(context)
             if triggered:
-                triggered_rules.append(rule.id)
+                mask |= bit
                 if message:
                     messages.append(message)
 
@@ -627,8 +678,8 @@ class RiskAgent(BaseAgent):
                     max_risk = rule.risk_tier
 
         return {
-            "triggered": len(triggered_rules) > 0,
-            "rules": triggered_rules,
+            "triggered": mask != 0,
+            "mask": mask,
             "messages": messages,
             "risk_tier": max_risk,
         }
@@ -636,30 +687,21 @@ class RiskAgent(BaseAgent):
     def _evaluate_clinical_rules(self, context: dict[str, Any]) -> list[RiskScore]:
         """Evaluate clinical guideline-based rules."""
         scores = []
-        triggered_rules = []
+        mask = 0
         risk_factors = []
 
-        clinical_rules = [r for r in self.rules if r.rule_type == RuleType.CLINICAL]
-
         # Track points for scoring
         risk_points = 0
-        max_points = len(clinical_rules) * 2
+        max_points = self._clinical_max_points
 
-        for rule in clinical_rules:
+        for rule, points, bit in self._clinical_rules:
             triggered, message = rule.evaluate(context)
             if triggered:
-                triggered_rules.append(rule.id)
+                mask |= bit
                 risk_factors.append(message or rule.description)
 
                 # Add points based on rule risk tier
-                if rule.risk_tier == RISK_CRITICAL:
-                    risk_points += 4
-                elif rule.risk_tier == RISK_HIGH:
-                    risk_points += 3
-                elif rule.risk_tier == RISK_MODERATE:
-                    risk_points += 2
-                else:
-                    risk_points += 1
+                risk_points += points
 
         # Calculate score
         score = min(1.0, risk_points / max_points) if max_points > 0 else 0
@@ -680,8 +722,9 @@ class RiskAgent(BaseAgent):
                 score=score,
                 risk_tier=tier,
                 confidence=0.85,
-                explanation=f"Clinical rules: {len(triggered_rules)} triggered",
+                explanation=f"Clinical rules: {mask.bit_count()} triggered",
                 contributing_factors=risk_factors[:5],
+                rules_mask=mask,
             )
         )
 
@@ -882,7 +925,7 @@ class RiskAgent(BaseAgent):
             final_tier = clinical_tier
 
         # Then consider rule-based and ML tiers
-        tier_priority = {RISK_CRITICAL: 0, RISK_HIGH: 1, RISK_MODERATE: 2, RISK_LOW: 3}
+        tier_priority = RISK_TIER_PRIORITY
         if all_scores:
             max_model_tier = max(
                 (s.risk_tier for s in all_scores),
@@ -1059,11 +1102,12 @@ class RiskAgent(BaseAgent):
     ) -> AgentResponse:
         """Create response when safety rule triggers."""
         risk_tier = safety_result["risk_tier"]
+        triggered_rules = self.rules_from_mask(safety_result["mask"])
 
         explanation = f"""## ⚠️ SAFETY ALERT
 
 **Risk Tier:** {risk_tier}
-**Triggered Rules:** {', '.join(safety_result['rules'])}
+**Triggered Rules:** {', '.join(triggered_rules)}
 
 ### Critical Findings
 {chr(10).join('- ' + m for m in safety_result['messages'])}
@@ -1081,7 +1125,8 @@ Please seek medical evaluation immediately.
                 "confidence": 0.95,
                 "confidence_interval": {"lower": 0.9, "upper": 1.0},
                 "safety_override": True,
-                "triggered_rules": safety_result["rules"],
+                "triggered_rules": triggered_rules,
+                "triggered_rules_mask": safety_result["mask"],
                 "risk_factors": safety_result["messages"],
                 "model_scores": {},
             },
@@ -1092,8 +1137,7 @@ Please seek medical evaluation immediately.
 
     def _risk_priority(self, tier: str) -> int:
         """Get priority for risk tier (lower = higher priority)."""
-        priorities = {RISK_CRITICAL: 0, RISK_HIGH: 1, RISK_MODERATE: 2, RISK_LOW: 3}
-        return priorities.get(tier, 4)
+        return RISK_TIER_PRIORITY.get(tier, 4)
 
     def _generate_explanation(
         self,
@@ -10,6 +10,8 @@ Production-ready FastAPI server with:
 - OpenAPI documentation
 """
 
+import asyncio
+import contextlib
 import os
 import time
 from collections.abc import Callable
@@ -40,6 +42,11 @@ async def lifespan(app: FastAPI) -> Any:
     app.state.metrics = get_metrics_collector()
     app.state.started_at = time.time()
 
+    # Keep monthly table partitions created ahead of inserts (PostgreSQL only)
+    from ..db.database import maintain_partitions
+
+    partition_task = asyncio.create_task(maintain_partitions())
+
     # Initialize Vertex AI
     try:
         from ..services.vertex_ai_service import VERTEX_AI_AVAILABLE, get_vertex_ai_service
@@ -64,6 +71,9 @@ async def lifespan(app: FastAPI) -> Any:
 
     # Shutdown
     logger.info("Shutting down EPCID API server...")
+    partition_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await partition_task
 
 
 def create_app() -> FastAPI:
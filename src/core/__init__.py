@@ -11,12 +11,13 @@ Core components for the agentic architecture:
 
 from .decision_maker import Decision, DecisionMaker, RiskAssessment
 from .executor import Action, ActionResult, Executor
-from .memory import EpisodicMemory, Memory, SemanticMemory, ShortTermMemory
+from .memory import EpisodicMemory, Memory, SemanticMemory, SharedMemory, ShortTermMemory
 from .planner import Goal, Plan, Planner, Task
 from .reasoning import ChainOfThought, ReasoningEngine, SelfConsistency
 
 __all__ = [
     "Memory",
+    "SharedMemory",
     "ShortTermMemory",
     "EpisodicMemory",
     "SemanticMemory",
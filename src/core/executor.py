@@ -262,6 +262,25 @@ class AuditLogger:
             },
         )
 
+    async def flush(self, records: list[dict[str, Any]]) -> int:
+        """
+        Persist a batch of audit records to the audit_logs table.
+
+        All rows are written with one batched INSERT, so callers should
+        collect records for a whole batch and flush once at the end.
+
+        Returns:
+            Number of rows written
+        """
+        from ..db.database import insert_audit_logs
+
+        count = await insert_audit_logs(records)
+        self.audit_logger.info(
+            "AUDIT_FLUSH",
+            extra={"event_type": "audit_flush", "record_count": count},
+        )
+        return count
+
     def log_rollback(self, action: Action, success: bool) -> None:
         """Log rollback attempt."""
         level = logging.INFO if success else logging.ERROR
@@ -10,15 +10,20 @@ This enables longitudinal tracking of patient health signals over time.
 """
 
 import hashlib
-import json
 import logging
+import threading
 from abc import ABC, abstractmethod
-from collections import deque
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import partial
+from itertools import chain, islice
 from typing import Any, cast
 
+from ..utils.serialization import dumps
+
 logger = logging.getLogger("epcid.core.memory")
 
 
@@ -42,6 +47,8 @@ class MemoryItem:
     importance: float = 0.5
     access_count: int = 0
     last_accessed: datetime | None = None
+    # Serialized size of the content, set by Memory.store
+    nbytes: int = field(default=0, repr=False, compare=False)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -128,25 +135,45 @@ class ShortTermMemory(MemoryStore):
 
     Uses a bounded deque with time-based expiration.
     Maintains the most recent context for agent decision-making.
+
+    Stores are queued and applied in one pass (expiry and index rebuild)
+    on the next read, so consecutive writes do not each rescan the deque.
+    The queue is applied as soon as it holds ``max_items``, so a writer
+    that never reads still keeps at most ``max_items`` in the deque.
+
+    ``nbytes`` is the serialized size of the items held, queued or not;
+    ``on_release`` is called with the size of items that roll out of the
+    deque, expire, or are deleted.
+
+    Reads only scan the deque for expired items once the oldest timestamp
+    it may hold has passed the TTL, so repeated context loads with no
+    churn cost a slice of the newest items.
     """
 
     def __init__(
         self,
         max_items: int = 100,
         ttl_minutes: int = 60,
+        on_release: Callable[[int], None] | None = None,
     ):
         self.max_items = max_items
         self.ttl_minutes = ttl_minutes
+        self.nbytes = 0
+        self._on_release = on_release
         self._items: deque[MemoryItem] = deque(maxlen=max_items)
         self._index: dict[str, int] = {}
-        logger.info(f"Initialized ShortTermMemory: max_items={max_items}, ttl={ttl_minutes}min")
+        self._pending: list[MemoryItem] = []
+        # Lower bound on the timestamps in the deque, None when empty
+        self._oldest: datetime | None = None
+        logger.debug(f"Initialized ShortTermMemory: max_items={max_items}, ttl={ttl_minutes}min")
 
     def store(self, item: MemoryItem) -> bool:
         """Store an item in short-term memory."""
         try:
-            self._expire_old_items()
-            self._items.append(item)
-            self._rebuild_index()
+            self._pending.append(item)
+            self.nbytes += item.nbytes
+            if len(self._pending) >= self.max_items:
+                self._apply_pending()
             logger.debug(f"Stored item {item.id} in short-term memory")
             return True
         except Exception as e:
@@ -155,7 +182,7 @@ class ShortTermMemory(MemoryStore):
 
     def retrieve(self, item_id: str) -> MemoryItem | None:
         """Retrieve an item by ID."""
-        self._expire_old_items()
+        self._sync()
         if item_id in self._index:
             idx = self._index[item_id]
             if idx < len(self._items):
@@ -167,7 +194,7 @@ class ShortTermMemory(MemoryStore):
 
     def search(self, query: str, limit: int = 10) -> list[MemoryItem]:
         """Search for items containing the query string."""
-        self._expire_old_items()
+        self._sync()
         results = []
         query_lower = query.lower()
 
@@ -182,19 +209,22 @@ class ShortTermMemory(MemoryStore):
 
     def get_recent(self, n: int = 10) -> list[MemoryItem]:
         """Get the n most recent items."""
-        self._expire_old_items()
-        return list(reversed(list(self._items)))[:n]
+        self._sync()
+        return list(islice(reversed(self._items), n))
 
     def get_context_window(self, minutes: int = 30) -> list[MemoryItem]:
         """Get items from the last N minutes."""
+        self._apply_pending()
         cutoff = datetime.now(__import__("datetime").timezone.utc) - timedelta(minutes=minutes)
         return [item for item in self._items if item.timestamp > cutoff]
 
     def delete(self, item_id: str) -> bool:
         """Delete an item from short-term memory."""
+        self._apply_pending()
         if item_id in self._index:
             idx = self._index[item_id]
             if idx < len(self._items):
+                self._release([self._items[idx]])
                 self._items = deque(
                     [item for i, item in enumerate(self._items) if i != idx], maxlen=self.max_items
                 )
@@ -204,23 +234,59 @@ class ShortTermMemory(MemoryStore):
 
     def clear(self) -> None:
         """Clear all items from short-term memory."""
+        self._release(chain(self._items, self._pending))
         self._items.clear()
         self._index.clear()
+        self._pending.clear()
+        self._oldest = None
         logger.info("Cleared short-term memory")
 
+    def _release(self, items: Iterable[MemoryItem]) -> None:
+        """Stop counting items that leave short-term memory."""
+        freed = sum(item.nbytes for item in items)
+        if freed:
+            self.nbytes -= freed
+            if self._on_release is not None:
+                self._on_release(freed)
+
+    def _apply_pending(self) -> None:
+        """Move queued stores into the deque."""
+        if self._pending:
+            # The bounded deque drops its oldest items to make room
+            overflow = len(self._items) + len(self._pending) - self.max_items
+            if overflow > 0:
+                self._release(islice(chain(self._items, self._pending), overflow))
+            oldest = min(item.timestamp for item in self._pending)
+            if self._oldest is None or oldest < self._oldest:
+                self._oldest = oldest
+            self._items.extend(self._pending)
+            self._pending.clear()
+            self._rebuild_index()
+
+    def _sync(self) -> None:
+        """Apply queued stores and drop expired items before a read."""
+        self._apply_pending()
+        self._expire_old_items()
+
     def _expire_old_items(self) -> None:
         """Remove items older than TTL."""
         cutoff = datetime.now(__import__("datetime").timezone.utc) - timedelta(
             minutes=self.ttl_minutes
         )
+        if self._oldest is None or self._oldest > cutoff:
+            return
         original_count = len(self._items)
 
-        self._items = deque(
-            [item for item in self._items if item.timestamp > cutoff], maxlen=self.max_items
-        )
+        live: list[MemoryItem] = []
+        expired: list[MemoryItem] = []
+        for item in self._items:
+            (live if item.timestamp > cutoff else expired).append(item)
+        self._items = deque(live, maxlen=self.max_items)
+        self._oldest = min((item.timestamp for item in live), default=None)
 
         expired_count = original_count - len(self._items)
         if expired_count > 0:
+            self._release(expired)
             self._rebuild_index()
             logger.debug(f"Expired {expired_count} items from short-term memory")
 
@@ -229,6 +295,7 @@ class ShortTermMemory(MemoryStore):
         self._index = {item.id: i for i, item in enumerate(self._items)}
 
     def __len__(self) -> int:
+        self._apply_pending()
         return len(self._items)
 
 
@@ -238,25 +305,35 @@ class EpisodicMemory(MemoryStore):
 
     Stores structured episodes with temporal context, enabling
     pattern recognition across similar events over time.
+
+    ``nbytes`` is the serialized size of the items held; ``on_release`` is
+    called with the size of items that are replaced, deleted or cleared.
     """
 
     def __init__(
         self,
         max_episodes: int = 1000,
         compression_enabled: bool = True,
+        on_release: Callable[[int], None] | None = None,
     ):
         self.max_episodes = max_episodes
         self.compression_enabled = compression_enabled
+        self.nbytes = 0
+        self._on_release = on_release
         self._episodes: dict[str, Episode] = {}
         self._items: dict[str, MemoryItem] = {}
         self._child_episodes: dict[str, list[str]] = {}  # child_id -> episode_ids
         self._temporal_index: list[tuple[datetime, str]] = []  # (timestamp, episode_id)
-        logger.info(f"Initialized EpisodicMemory: max_episodes={max_episodes}")
+        logger.debug(f"Initialized EpisodicMemory: max_episodes={max_episodes}")
 
     def store(self, item: MemoryItem) -> bool:
         """Store a memory item."""
         try:
+            replaced = self._items.get(item.id)
+            if replaced is not None:
+                self._release(replaced)
             self._items[item.id] = item
+            self.nbytes += item.nbytes
             logger.debug(f"Stored item {item.id} in episodic memory")
             return True
         except Exception as e:
@@ -343,7 +420,7 @@ class EpisodicMemory(MemoryStore):
     def delete(self, item_id: str) -> bool:
         """Delete a memory item."""
         if item_id in self._items:
-            del self._items[item_id]
+            self._release(self._items.pop(item_id))
             return True
         return False
 
@@ -369,12 +446,23 @@ class EpisodicMemory(MemoryStore):
 
     def clear(self) -> None:
         """Clear all episodic memory."""
+        freed = self.nbytes
+        self.nbytes = 0
+        if freed and self._on_release is not None:
+            self._on_release(freed)
         self._episodes.clear()
         self._items.clear()
         self._child_episodes.clear()
         self._temporal_index.clear()
         logger.info("Cleared episodic memory")
 
+    def _release(self, item: MemoryItem) -> None:
+        """Stop counting an item that leaves episodic memory."""
+        if item.nbytes:
+            self.nbytes -= item.nbytes
+            if self._on_release is not None:
+                self._on_release(item.nbytes)
+
     def _evict_oldest_episode(self) -> None:
         """Evict the oldest episode to make room."""
         if self._temporal_index:
@@ -541,16 +629,26 @@ class Memory:
         short_term_config: dict[str, Any] | None = None,
         episodic_config: dict[str, Any] | None = None,
         semantic_config: dict[str, Any] | None = None,
+        semantic: SemanticMemory | None = None,
+        on_resize: Callable[[int], None] | None = None,
     ):
         short_term_config = short_term_config or {}
         episodic_config = episodic_config or {}
         semantic_config = semantic_config or {}
 
-        self.short_term = ShortTermMemory(**short_term_config)
-        self.episodic = EpisodicMemory(**episodic_config)
-        self.semantic = SemanticMemory(**semantic_config)
+        # Called with the change in serialized bytes held by short-term and
+        # episodic memory: positive on store, negative when items leave
+        self._on_resize = on_resize
 
-        logger.info("Initialized unified Memory system")
+        self.short_term = ShortTermMemory(**short_term_config, on_release=self._released)
+        self.episodic = EpisodicMemory(**episodic_config, on_release=self._released)
+        if semantic is None:
+            self.semantic = SemanticMemory(**semantic_config)
+            logger.info("Initialized unified Memory system")
+        else:
+            # Views over a shared semantic store are created per namespace
+            self.semantic = semantic
+            logger.debug("Initialized Memory view over shared semantic memory")
 
     def store(
         self,
@@ -561,13 +659,15 @@ class Memory:
         importance: float = 0.5,
     ) -> MemoryItem:
         """Store content in the specified memory type."""
+        content_str = dumps(content, default=str)
         item = MemoryItem(
-            id=self._generate_id(content),
+            id=self._generate_id(content_str),
             content=content,
             timestamp=datetime.now(__import__("datetime").timezone.utc),
             metadata=metadata or {},
             embedding=embedding,
             importance=importance,
+            nbytes=len(content_str),
         )
 
         if memory_type == MemoryType.SHORT_TERM:
@@ -577,6 +677,9 @@ class Memory:
         elif memory_type == MemoryType.SEMANTIC:
             self.semantic.store(item)
 
+        if self._on_resize is not None and memory_type != MemoryType.SEMANTIC:
+            self._on_resize(item.nbytes)
+
         return item
 
     def retrieve(
@@ -640,10 +743,145 @@ class Memory:
         self.semantic.clear()
         logger.info("Cleared all memory stores")
 
+    def _released(self, nbytes: int) -> None:
+        """Report bytes freed by the short-term or episodic store."""
+        if self._on_resize is not None:
+            self._on_resize(-nbytes)
+
     @staticmethod
-    def _generate_id(content: Any) -> str:
-        """Generate a unique ID for content."""
+    def _generate_id(content_str: str) -> str:
+        """Generate a unique ID for serialized content."""
         timestamp = datetime.now(__import__("datetime").timezone.utc).isoformat()
-        content_str = json.dumps(content, default=str)
         hash_input = f"{timestamp}:{content_str}"
         return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+
+
+class SharedMemory:
+    """
+    Process-wide memory shared by every request.
+
+    Semantic memory (guidelines, learned patterns) is read-heavy and
+    child-agnostic, so a single store is shared across requests. Short-term
+    and episodic memory are per namespace (typically one per child), so one
+    child's observations never appear in another child's context.
+
+    Each namespace counts the serialized size of the items it holds, so
+    items that roll out of short-term memory, expire or are deleted stop
+    counting. When a store takes the total past ``max_bytes``, or a new
+    namespace takes the count past ``max_namespaces``, other namespaces are
+    evicted least-recently-used until both fit again.
+    """
+
+    _instance: "SharedMemory | None" = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_namespaces: int = 10_000,
+        short_term_config: dict[str, Any] | None = None,
+        episodic_config: dict[str, Any] | None = None,
+        semantic_config: dict[str, Any] | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_namespaces = max_namespaces
+        self._short_term_config = short_term_config or {}
+        self._episodic_config = episodic_config or {}
+
+        # Root memory for callers without a namespace; owns the shared semantic store
+        self.root = Memory(
+            short_term_config=self._short_term_config,
+            episodic_config=self._episodic_config,
+            semantic_config=semantic_config,
+        )
+        self.semantic = self.root.semantic
+
+        self._namespaces: OrderedDict[str, Memory] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        # Identifies the Memory currently registered under each key, so late
+        # callbacks from an evicted view never count against its successor
+        self._owners: dict[str, object] = {}
+        self._total_bytes = 0
+        self._namespace_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "SharedMemory":
+        """Get the process-wide shared memory, creating it on first use."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def namespace(self, key: str) -> Memory:
+        """
+        Get the memory view for a namespace, creating it on first use.
+
+        The view has its own short-term and episodic stores and shares the
+        semantic store with every other namespace.
+
+        Args:
+            key: Namespace key, e.g. a child ID
+
+        Returns:
+            Memory view for the namespace
+        """
+        with self._namespace_lock:
+            memory = self._namespaces.get(key)
+            if memory is None:
+                owner = object()
+                memory = Memory(
+                    short_term_config=self._short_term_config,
+                    episodic_config=self._episodic_config,
+                    semantic=self.semantic,
+                    on_resize=partial(self._account, key, owner),
+                )
+                self._namespaces[key] = memory
+                self._sizes[key] = 0
+                self._owners[key] = owner
+                logger.debug(f"Created memory namespace {key}")
+                self._evict(keep=key)
+            else:
+                self._namespaces.move_to_end(key)
+
+            return memory
+
+    def __len__(self) -> int:
+        return len(self._namespaces)
+
+    @property
+    def total_bytes(self) -> int:
+        """Serialized bytes held by the live namespaces."""
+        return self._total_bytes
+
+    def clear(self) -> None:
+        """Drop all namespaces and clear the shared stores."""
+        with self._namespace_lock:
+            self._namespaces.clear()
+            self._sizes.clear()
+            self._owners.clear()
+            self._total_bytes = 0
+        self.root.clear_all()
+
+    def _account(self, key: str, owner: object, delta: int) -> None:
+        """Track a namespace's change in size and evict if a store takes it over budget."""
+        with self._namespace_lock:
+            # Views that were already evicted are not tracked
+            if self._owners.get(key) is not owner:
+                return
+            self._sizes[key] += delta
+            self._total_bytes += delta
+            if delta > 0:
+                self._evict(keep=key)
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used namespaces, except ``keep``, until within both limits."""
+        for key in list(self._namespaces):
+            if self._total_bytes <= self.max_bytes and len(self._namespaces) <= self.max_namespaces:
+                break
+            if key == keep:
+                continue
+            del self._namespaces[key]
+            del self._owners[key]
+            self._total_bytes -= self._sizes.pop(key)
+            logger.debug(f"Evicted memory namespace {key}")
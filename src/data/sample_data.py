@@ -20,7 +20,7 @@ def create_sample_data() -> Dict[str, Any]:
     # Sample users
     users = [
         {
-            "id": "user-demo-001",
+            "id": "00000000-0000-4000-8000-000000000001",
             "email": "demo@epcid.health",
             "full_name": "Demo Parent",
             "phone": "+1-555-123-4567",
@@ -29,7 +29,7 @@ def create_sample_data() -> Dict[str, Any]:
             "created_at": (now - timedelta(days=30)).isoformat(),
         },
         {
-            "id": "user-demo-002",
+            "id": "00000000-0000-4000-8000-000000000003",
             "email": "test@epcid.health",
             "full_name": "Test User",
             "phone": "+1-555-987-6543",
@@ -42,8 +42,8 @@ def create_sample_data() -> Dict[str, Any]:
     # Sample children
     children = [
         {
-            "id": "child-demo-001",
-            "user_id": "user-demo-001",
+            "id": "00000000-0000-4000-8000-000000000002",
+            "user_id": "00000000-0000-4000-8000-000000000001",
             "name": "Emma",
             "date_of_birth": (now - timedelta(days=365 * 3)).isoformat(),
             "gender": "female",
@@ -53,8 +53,8 @@ def create_sample_data() -> Dict[str, Any]:
             "age_months": 36,
         },
         {
-            "id": "child-demo-002",
-            "user_id": "user-demo-001",
+            "id": "00000000-0000-4000-8000-000000000004",
+            "user_id": "00000000-0000-4000-8000-000000000001",
             "name": "Liam",
             "date_of_birth": (now - timedelta(days=365 * 6)).isoformat(),
             "gender": "male",
@@ -64,8 +64,8 @@ def create_sample_data() -> Dict[str, Any]:
             "age_months": 72,
         },
         {
-            "id": "child-demo-003",
-            "user_id": "user-demo-002",
+            "id": "00000000-0000-4000-8000-000000000005",
+            "user_id": "00000000-0000-4000-8000-000000000003",
             "name": "Olivia",
             "date_of_birth": (now - timedelta(days=180)).isoformat(),
             "gender": "female",
@@ -80,8 +80,8 @@ def create_sample_data() -> Dict[str, Any]:
     symptoms = [
         # Emma - asthma exacerbation scenario
         {
-            "id": "sym-demo-001",
-            "child_id": "child-demo-001",
+            "id": "00000000-0000-4000-8000-000000000101",
+            "child_id": "00000000-0000-4000-8000-000000000002",
             "symptom_type": "cough",
             "severity": "moderate",
             "onset_time": (now - timedelta(hours=6)).isoformat(),
@@ -90,8 +90,8 @@ def create_sample_data() -> Dict[str, Any]:
             "notes": "Dry cough, worse at night",
         },
         {
-            "id": "sym-demo-002",
-            "child_id": "child-demo-001",
+            "id": "00000000-0000-4000-8000-000000000102",
+            "child_id": "00000000-0000-4000-8000-000000000002",
             "symptom_type": "wheeze",
             "severity": "mild",
             "onset_time": (now - timedelta(hours=4)).isoformat(),
@@ -101,8 +101,8 @@ def create_sample_data() -> Dict[str, Any]:
         },
         # Liam - cold scenario
         {
-            "id": "sym-demo-003",
-            "child_id": "child-demo-002",
+            "id": "00000000-0000-4000-8000-000000000103",
+            "child_id": "00000000-0000-4000-8000-000000000004",
             "symptom_type": "fever",
             "severity": "mild",
             "onset_time": (now - timedelta(hours=12)).isoformat(),
@@ -111,8 +111,8 @@ def create_sample_data() -> Dict[str, Any]:
             "notes": "Low-grade fever started last night",
         },
         {
-            "id": "sym-demo-004",
-            "child_id": "child-demo-002",
+            "id": "00000000-0000-4000-8000-000000000104",
+            "child_id": "00000000-0000-4000-8000-000000000004",
             "symptom_type": "congestion",
             "severity": "moderate",
             "onset_time": (now - timedelta(hours=24)).isoformat(),
@@ -122,8 +122,8 @@ def create_sample_data() -> Dict[str, Any]:
         },
         # Olivia - infant fever scenario (higher concern)
         {
-            "id": "sym-demo-005",
-            "child_id": "child-demo-003",
+            "id": "00000000-0000-4000-8000-000000000105",
+            "child_id": "00000000-0000-4000-8000-000000000005",
             "symptom_type": "fever",
             "severity": "moderate",
             "onset_time": (now - timedelta(hours=2)).isoformat(),
@@ -132,8 +132,8 @@ def create_sample_data() -> Dict[str, Any]:
             "notes": "Noticed during feeding, seems fussy",
         },
         {
-            "id": "sym-demo-006",
-            "child_id": "child-demo-003",
+            "id": "00000000-0000-4000-8000-000000000106",
+            "child_id": "00000000-0000-4000-8000-000000000005",
             "symptom_type": "irritability",
             "severity": "moderate",
             "onset_time": (now - timedelta(hours=3)).isoformat(),
@@ -146,8 +146,8 @@ def create_sample_data() -> Dict[str, Any]:
     # Sample assessments
     assessments = [
         {
-            "id": "assess-demo-001",
-            "child_id": "child-demo-001",
+            "id": "00000000-0000-4000-8000-000000000201",
+            "child_id": "00000000-0000-4000-8000-000000000002",
             "risk_level": "moderate",
             "risk_score": 0.45,
             "confidence": 0.82,
@@ -188,8 +188,8 @@ def create_sample_data() -> Dict[str, Any]:
             "created_at": (now - timedelta(hours=2)).isoformat(),
         },
         {
-            "id": "assess-demo-002",
-            "child_id": "child-demo-003",
+            "id": "00000000-0000-4000-8000-000000000202",
+            "child_id": "00000000-0000-4000-8000-000000000005",
             "risk_level": "high",
             "risk_score": 0.68,
             "confidence": 0.75,
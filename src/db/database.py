@@ -4,15 +4,22 @@ EPCID Database Configuration
 SQLAlchemy async database setup with connection pooling.
 """
 
+import asyncio
+import logging
 import os
 from collections.abc import AsyncGenerator, Generator
 from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
 from typing import Any
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, insert, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+from ..utils.serialization import dumps, loads
+
+logger = logging.getLogger("epcid.db")
+
 # Database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/epcid.db")
 
@@ -31,18 +38,37 @@ class Base(DeclarativeBase):
     pass
 
 
+# Connection pool sizing for server databases. DB_POOL_SIZE should match the
+# number of concurrent workflows (e.g. the batch symptom check's concurrency)
+# so requests never queue for a connection. Pre-ping (a round trip per
+# checkout) replaces connections broken by a database restart or failover;
+# DB_POOL_PRE_PING=false opts out, leaving only the DB_POOL_RECYCLE age limit.
+POOL_OPTIONS: dict[str, Any] = {
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+}
+if not DATABASE_URL.startswith("sqlite:"):
+    POOL_OPTIONS.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "16")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "4")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    )
+
 # Synchronous engine (for migrations and testing)
 engine = create_engine(
     DATABASE_URL,
     echo=os.getenv("SQL_ECHO", "false").lower() == "true",
-    pool_pre_ping=True,
+    json_serializer=dumps,
+    json_deserializer=loads,
+    **POOL_OPTIONS,
 )
 
 # Asynchronous engine (for application runtime)
 async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
     echo=os.getenv("SQL_ECHO", "false").lower() == "true",
-    pool_pre_ping=True,
+    json_serializer=dumps,
+    json_deserializer=loads,
+    **POOL_OPTIONS,
 )
 
 # Session factories
@@ -147,6 +173,97 @@ async def init_async_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+# Tables range-partitioned by month on PostgreSQL (see migration 0002)
+PARTITIONED_TABLES = ("audit_logs", "symptoms")
+
+# How often the running application re-runs ensure_partitions
+PARTITION_CHECK_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def ensure_partitions(months_ahead: int = 3, today: date | None = None) -> list[str]:
+    """
+    Pre-create monthly partitions for the partitioned tables.
+
+    Creates partitions for the current month and the next ``months_ahead``
+    months. There is no default partition, so an insert for a month
+    without a partition fails: the API runs this at startup and daily (see
+    maintain_partitions), and scripts/run.sh after migrations. Months are
+    UTC, like the timestamp column defaults. No-op on databases other than
+    PostgreSQL.
+
+    Returns:
+        Names of the partitions that were ensured
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    today = today or datetime.now(timezone.utc).date()  # noqa: UP017
+    year, month = today.year, today.month
+    ensured = []
+
+    with engine.begin() as conn:
+        for _ in range(months_ahead + 1):
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            for table in PARTITIONED_TABLES:
+                name = f"{table}_{year:04d}_{month:02d}"
+                conn.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{year:04d}-{month:02d}-01') "
+                        f"TO ('{next_year:04d}-{next_month:02d}-01')"
+                    )
+                )
+                ensured.append(name)
+            year, month = next_year, next_month
+
+    return ensured
+
+
+async def maintain_partitions(
+    interval_seconds: float = PARTITION_CHECK_INTERVAL_SECONDS,
+) -> None:
+    """
+    Run ensure_partitions now and then every ``interval_seconds`` until
+    cancelled, so a long-running deployment never reaches a month without
+    partitions. Failures are logged and retried on the next run.
+    """
+    while True:
+        try:
+            ensured = await asyncio.to_thread(ensure_partitions)
+            if ensured:
+                logger.info("Ensured %d table partitions", len(ensured))
+        except Exception:
+            logger.exception("Failed to ensure table partitions")
+        await asyncio.sleep(interval_seconds)
+
+
+async def insert_audit_logs(records: list[dict[str, Any]]) -> int:
+    """
+    Insert many audit log rows in one statement.
+
+    Uses a single Core INSERT executed with the whole parameter list, which
+    SQLAlchemy sends as batched multi-row VALUES (executemany), instead of
+    adding and flushing one ORM object per row.
+
+    Args:
+        records: Column values per row (``action``, ``resource_type`` and
+            optionally ``user_id``, ``resource_id``, ``request_id``,
+            ``details``, ``timestamp``, ...); every row must have the same keys
+
+    Returns:
+        Number of rows inserted
+    """
+    if not records:
+        return 0
+
+    from .models import AuditLog
+
+    async with async_engine.begin() as conn:
+        await conn.execute(insert(AuditLog), records)
+
+    return len(records)
+
+
 def drop_db() -> None:
     """
     Drop all database tables.
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import enum
 from datetime import datetime
-from typing import cast
+from typing import Any, cast
 from uuid import uuid4
 
 from sqlalchemy import (
@@ -20,13 +20,49 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    PrimaryKeyConstraint,
     String,
     Text,
+    Uuid,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.schema import CreateColumn
 
 from .database import Base
 
+# JSONB on PostgreSQL, plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# Native UUID on PostgreSQL, CHAR(32) elsewhere; values stay strings in Python
+UUIDType = Uuid(as_uuid=False)
+
+
+def _is_sqlite_rowid_key(column: Any) -> bool:
+    """Whether a column autoincrements inside a composite primary key."""
+    table = column.table
+    return column is table.autoincrement_column and len(table.primary_key.columns) > 1
+
+
+# SQLite only autoincrements a lone INTEGER PRIMARY KEY, so a table keyed on
+# (id, partition column) for PostgreSQL keeps just the rowid-backed id there
+@compiles(PrimaryKeyConstraint, "sqlite")
+def _sqlite_primary_key(constraint: PrimaryKeyConstraint, compiler: Any, **kw: Any) -> str:
+    column = constraint.table.autoincrement_column
+    if column is not None and _is_sqlite_rowid_key(column):
+        return f"PRIMARY KEY ({compiler.preparer.format_column(column)})"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
+
+
+@compiles(CreateColumn, "sqlite")
+def _sqlite_create_column(element: CreateColumn, compiler: Any, **kw: Any) -> str:
+    column = element.element
+    if _is_sqlite_rowid_key(column):
+        return f"{compiler.preparer.format_column(column)} INTEGER NOT NULL"
+    return compiler.visit_create_column(element, **kw)
+
 
 def generate_uuid() -> str:
     """Generate a UUID string."""
@@ -77,7 +113,7 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     full_name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -101,7 +137,7 @@ class User(Base):
     last_login: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # Preferences
-    preferences: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    preferences: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
 
     # Relationships
     children: Mapped[list[Child]] = relationship(
@@ -120,9 +156,9 @@ class Child(Base):
 
     __tablename__ = "children"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     # Basic info
@@ -131,9 +167,9 @@ class Child(Base):
     gender: Mapped[Gender] = mapped_column(Enum(Gender), nullable=False)
 
     # Medical info
-    medical_conditions: Mapped[list | None] = mapped_column(JSON, default=list)
-    allergies: Mapped[list | None] = mapped_column(JSON, default=list)
-    medications: Mapped[list | None] = mapped_column(JSON, default=list)
+    medical_conditions: Mapped[list | None] = mapped_column(JSONType, default=list)
+    allergies: Mapped[list | None] = mapped_column(JSONType, default=list)
+    medications: Mapped[list | None] = mapped_column(JSONType, default=list)
 
     # Additional info
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -183,6 +219,13 @@ class Child(Base):
                 return f"{years} years, {remaining_months} months"
             return f"{years} years"
 
+    # Indexes
+    __table_args__ = (
+        Index(
+            "ix_children_medical_conditions_gin", "medical_conditions", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self) -> str:
         return f"<Child {self.name} ({self.age_display})>"
 
@@ -192,15 +235,17 @@ class Symptom(Base):
 
     __tablename__ = "symptoms"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    # recorded_at is part of the key because PostgreSQL partitions the table
+    # on it (migration 0002)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
     child_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=False, index=True
+        UUIDType, ForeignKey("children.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     # Symptom details
     symptom_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     severity: Mapped[SymptomSeverity] = mapped_column(Enum(SymptomSeverity), nullable=False)
-    measurements: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    measurements: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Timing
@@ -208,7 +253,7 @@ class Symptom(Base):
     recorded_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=lambda: datetime.now(__import__("datetime").timezone.utc),
-        nullable=False,
+        primary_key=True,
         index=True,
     )
     resolved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -231,29 +276,29 @@ class Assessment(Base):
 
     __tablename__ = "assessments"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
     child_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=False, index=True
+        UUIDType, ForeignKey("children.id", ondelete="CASCADE"), nullable=False
     )
 
     # Risk assessment
-    risk_level: Mapped[RiskLevel] = mapped_column(Enum(RiskLevel), nullable=False, index=True)
+    risk_level: Mapped[RiskLevel] = mapped_column(Enum(RiskLevel), nullable=False)
     risk_score: Mapped[float] = mapped_column(Float, nullable=False)
     confidence: Mapped[float] = mapped_column(Float, nullable=False)
 
     # Input data
-    symptoms_input: Mapped[dict] = mapped_column(JSON, nullable=False)
-    location: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    symptoms_input: Mapped[dict] = mapped_column(JSONType, nullable=False)
+    location: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
 
     # Results
-    risk_factors: Mapped[list] = mapped_column(JSON, default=list)
-    red_flags: Mapped[list] = mapped_column(JSON, default=list)
-    warning_signs: Mapped[list] = mapped_column(JSON, default=list)
+    risk_factors: Mapped[list] = mapped_column(JSONType, default=list)
+    red_flags: Mapped[list] = mapped_column(JSONType, default=list)
+    warning_signs: Mapped[list] = mapped_column(JSONType, default=list)
 
     # Recommendations
     primary_recommendation: Mapped[str] = mapped_column(Text, nullable=False)
-    secondary_recommendations: Mapped[list] = mapped_column(JSON, default=list)
-    suggested_actions: Mapped[list] = mapped_column(JSON, default=list)
+    secondary_recommendations: Mapped[list] = mapped_column(JSONType, default=list)
+    suggested_actions: Mapped[list] = mapped_column(JSONType, default=list)
     when_to_seek_care: Mapped[str] = mapped_column(Text, nullable=False)
 
     # Explanations
@@ -261,7 +306,7 @@ class Assessment(Base):
     clinical_reasoning: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Environmental context
-    environmental_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    environmental_data: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
@@ -279,8 +324,20 @@ class Assessment(Base):
 
     # Indexes
     __table_args__ = (
-        Index("ix_assessments_child_created", "child_id", "created_at"),
+        # Covers "latest assessments for child" without touching the heap
+        Index(
+            "ix_assessments_child_created_covering",
+            "child_id",
+            text("created_at DESC"),
+            postgresql_include=["risk_level", "risk_score"],
+        ),
         Index("ix_assessments_risk_created", "risk_level", "created_at"),
+        Index("ix_assessments_symptoms_gin", "symptoms_input", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        Index("ix_assessments_risk_factors_gin", "risk_factors", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
     )
 
     def __repr__(self) -> str:
@@ -292,14 +349,16 @@ class AuditLog(Base):
 
     __tablename__ = "audit_logs"
 
+    # timestamp is part of the key because PostgreSQL partitions the table
+    # on it (migration 0002); SQLite keys on id alone (see _sqlite_primary_key)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+        UUIDType, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
 
     # Action details
-    action: Mapped[AuditAction] = mapped_column(Enum(AuditAction), nullable=False, index=True)
-    resource_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    action: Mapped[AuditAction] = mapped_column(Enum(AuditAction), nullable=False)
+    resource_type: Mapped[str] = mapped_column(String(50), nullable=False)
     resource_id: Mapped[str | None] = mapped_column(String(36), nullable=True, index=True)
 
     # Request context
@@ -308,13 +367,13 @@ class AuditLog(Base):
     request_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
 
     # Details
-    details: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    details: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
 
     # Timestamp
     timestamp: Mapped[datetime] = mapped_column(
         DateTime,
         default=lambda: datetime.now(__import__("datetime").timezone.utc),
-        nullable=False,
+        primary_key=True,
         index=True,
     )
 
@@ -323,9 +382,18 @@ class AuditLog(Base):
 
     # Indexes
     __table_args__ = (
-        Index("ix_audit_user_timestamp", "user_id", "timestamp"),
+        # Covers "recent activity for user" without touching the heap
+        Index(
+            "ix_audit_user_timestamp_covering",
+            "user_id",
+            text("timestamp DESC"),
+            postgresql_include=["action", "resource_type"],
+        ),
         Index("ix_audit_action_timestamp", "action", "timestamp"),
         Index("ix_audit_resource", "resource_type", "resource_id"),
+        Index("ix_audit_logs_details_gin", "details", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
     )
 
     def __repr__(self) -> str:
@@ -337,9 +405,9 @@ class RefreshToken(Base):
 
     __tablename__ = "refresh_tokens"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     # Token info
@@ -367,7 +435,7 @@ class EnvironmentData(Base):
 
     __tablename__ = "environment_data"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
 
     # Location
     latitude: Mapped[float] = mapped_column(Float, nullable=False)
@@ -377,7 +445,7 @@ class EnvironmentData(Base):
     # Air quality
     aqi: Mapped[int | None] = mapped_column(Integer, nullable=True)
     aqi_category: Mapped[str | None] = mapped_column(String(50), nullable=True)
-    pollutants: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    pollutants: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
 
     # Weather
     temperature: Mapped[float | None] = mapped_column(Float, nullable=True)
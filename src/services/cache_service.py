@@ -8,11 +8,12 @@ Provides caching for:
 - Temporary computation results
 """
 
-import json
 import logging
 import os
 from typing import Any
 
+from ..utils.serialization import dumps, loads
+
 logger = logging.getLogger(__name__)
 
 # Redis client - lazy loaded
@@ -94,7 +95,7 @@ class CacheService:
             try:
                 value = self._redis.get(key)
                 if value:
-                    return json.loads(value)
+                    return loads(value)
             except Exception as e:
                 logger.debug(f"Redis get error: {e}")
 
@@ -113,7 +114,7 @@ class CacheService:
         Returns:
             True if successful
         """
-        serialized = json.dumps(value)
+        serialized = dumps(value)
 
         # Try Redis first
         if self._redis:
@@ -17,6 +17,27 @@ from typing import Any
 
 logger = logging.getLogger("epcid.utils.explainability")
 
+# Caregiver-facing explanation for each risk tier
+RISK_TIER_EXPLANATIONS = {
+    "CRITICAL": "Immediate medical attention is required. This assessment indicates potentially serious symptoms.",
+    "HIGH": "Urgent medical evaluation is recommended within the next few hours.",
+    "MODERATE": "Medical consultation is recommended. Please contact your pediatrician.",
+    "LOW": "Home monitoring is appropriate. Continue to watch for changes.",
+}
+
+# Precomputed (summary, section title, section content, importance) per tier
+_RISK_TIER_HEADERS = {
+    tier: (
+        f"Risk Assessment: {tier}",
+        f"Risk Level: {tier}",
+        content,
+        "high" if tier in ("CRITICAL", "HIGH") else "medium",
+    )
+    for tier, content in RISK_TIER_EXPLANATIONS.items()
+}
+
+IMPORTANCE_MARKERS = {"high": "🔴", "medium": "🟡"}
+
 
 @dataclass
 class ExplanationSection:
@@ -47,11 +68,7 @@ class Explanation:
         ]
 
         for section in self.sections:
-            importance_marker = (
-                "🔴"
-                if section.importance == "high"
-                else "🟡" if section.importance == "medium" else "🟢"
-            )
+            importance_marker = IMPORTANCE_MARKERS.get(section.importance, "🟢")
             lines.append(f"## {importance_marker} {section.title}")
             lines.append(section.content)
 
@@ -135,24 +152,15 @@ class ExplanationGenerator:
         Returns:
             Explanation object
         """
-        sections = []
-
-        # Risk tier explanation
-        tier_explanations = {
-            "CRITICAL": "Immediate medical attention is required. This assessment indicates potentially serious symptoms.",
-            "HIGH": "Urgent medical evaluation is recommended within the next few hours.",
-            "MODERATE": "Medical consultation is recommended. Please contact your pediatrician.",
-            "LOW": "Home monitoring is appropriate. Continue to watch for changes.",
-        }
-
-        sections.append(
-            ExplanationSection(
-                title=f"Risk Level: {risk_tier}",
-                content=tier_explanations.get(risk_tier, "Assessment complete."),
-                importance="high" if risk_tier in ["CRITICAL", "HIGH"] else "medium",
-            )
+        summary, title, content, importance = _RISK_TIER_HEADERS.get(risk_tier) or (
+            f"Risk Assessment: {risk_tier}",
+            f"Risk Level: {risk_tier}",
+            "Assessment complete.",
+            "medium",
         )
 
+        sections = [ExplanationSection(title=title, content=content, importance=importance)]
+
         # Safety alerts
         if triggered_rules:
             sections.append(
@@ -210,9 +218,10 @@ class ExplanationGenerator:
 
         # Model contributions
         if model_scores:
-            model_content = "Multiple analysis methods were used:\n"
-            for model, score in model_scores.items():
-                model_content += f"- {model.replace('_', ' ').title()}: {score:.0%}\n"
+            model_content = "Multiple analysis methods were used:\n" + "".join(
+                f"- {model.replace('_', ' ').title()}: {score:.0%}\n"
+                for model, score in model_scores.items()
+            )
 
             sections.append(
                 ExplanationSection(
@@ -229,7 +238,7 @@ class ExplanationGenerator:
         )
 
         return Explanation(
-            summary=f"Risk Assessment: {risk_tier}",
+            summary=summary,
             sections=sections,
             confidence_statement=confidence_statement,
             disclaimers=self.STANDARD_DISCLAIMERS if self.include_disclaimers else [],
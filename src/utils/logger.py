@@ -8,13 +8,14 @@ Provides structured logging with:
 - Log level management
 """
 
-import json
 import logging
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .serialization import dumps
+
 
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
@@ -44,7 +45,7 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data)
+        return dumps(log_data)
 
 
 class ContextFilter(logging.Filter):
@@ -0,0 +1,53 @@
+"""
+EPCID JSON Serialization
+
+Single JSON codec for agent results, cache entries, structured logs and
+database JSON columns. Uses orjson when installed and falls back to the
+standard library with the same compact output.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        obj: Object to serialize
+        default: Fallback converter for types the codec does not handle
+
+    Returns:
+        Compact JSON string
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumpb(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON bytes, e.g. for a response body.
+
+    Same output as dumps() without decoding orjson's bytes to str.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+    return dumps(obj, default=default).encode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Deserialize a JSON string or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
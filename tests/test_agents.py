@@ -11,15 +11,24 @@ Tests for the EPCID agent system including:
 - EscalationAgent
 """
 
+import copy
+from datetime import timedelta
+
 import pytest
 
-from src.agents.base_agent import AgentStatus
+from src.agents.base_agent import AgentConfig, AgentStatus
 from src.agents.escalation_agent import EscalationAgent
-from src.agents.guideline_rag_agent import GuidelineRAGAgent
+from src.agents.geo_exposure_agent import EnvironmentalConditions, GeoExposureAgent
+from src.agents.guideline_rag_agent import (
+    BM25Index,
+    GuidelineCache,
+    GuidelineRAGAgent,
+)
 from src.agents.ingestion_agent import IngestionAgent
 from src.agents.phenotype_agent import PhenotypeAgent
 from src.agents.risk_agent import RiskAgent
-from src.core.memory import Memory
+from src.core.memory import Memory, SharedMemory
+from src.utils.serialization import loads
 
 
 @pytest.fixture
@@ -245,6 +254,73 @@ class TestRiskAgent:
         assert response.data["risk_tier"] == "CRITICAL"
         assert len(response.data["triggered_rules"]) > 0
 
+    @pytest.mark.asyncio
+    async def test_rule_replacement_recompiles(self, memory):
+        """Test replacing the rule set takes effect on the next request."""
+        agent = RiskAgent(memory=memory)
+        agent.rules = [r for r in agent.rules if r.id != "SAFETY_INFANT_FEVER"]
+
+        input_data = {
+            "normalized": {
+                "demographics": {"age_months": 2},
+                "symptoms": ["fever"],
+                "vitals": {"temperature": 38.1},
+            },
+            "phenotypes": [],
+        }
+
+        response = await agent.run(input_data)
+
+        assert response.success
+        assert "SAFETY_INFANT_FEVER" not in response.data["triggered_rules"]
+
+    @pytest.mark.asyncio
+    async def test_triggered_rules_mask_resolves_to_ids(self, memory):
+        """Test the triggered-rules mask expands to the reported rule ids."""
+        agent = RiskAgent(memory=memory)
+
+        input_data = {
+            "normalized": {
+                "demographics": {"age_months": 2},
+                "symptoms": ["fever"],
+                "vitals": {"temperature": 38.5},
+            },
+            "phenotypes": [],
+        }
+
+        response = await agent.run(input_data)
+
+        mask = response.data["triggered_rules_mask"]
+        assert agent.rules_from_mask(mask) == response.data["triggered_rules"]
+        assert "SAFETY_INFANT_FEVER" in agent.rules_from_mask(mask)
+
+    @pytest.mark.asyncio
+    async def test_clinical_rules_mask_resolves_to_ids(self, memory):
+        """Test the clinical-rules mask names the clinical rules that fired."""
+        agent = RiskAgent(memory=memory)
+
+        input_data = {
+            "normalized": {
+                "demographics": {"age_months": 36},
+                "symptoms": ["fever"],
+                "vitals": {"temperature": 40.2, "heart_rate": 170},
+            },
+            "phenotypes": [],
+        }
+
+        response = await agent.run(input_data)
+
+        assert "triggered_rules_mask" not in response.data
+        mask = response.data["clinical_rules_mask"]
+        assert agent.rules_from_mask(mask) == ["CLINICAL_HIGH_FEVER", "CLINICAL_TACHYCARDIA"]
+
+    def test_rules_reject_in_place_edits(self, memory):
+        """Test the rule set can only be changed by assignment."""
+        agent = RiskAgent(memory=memory)
+
+        with pytest.raises(AttributeError):
+            agent.rules.append(agent.rules[0])
+
     @pytest.mark.asyncio
     async def test_confidence_calculation(self, memory, sample_input):
         """Test confidence is calculated."""
@@ -301,6 +377,161 @@ class TestGuidelineRAGAgent:
         assert response.success
         assert response.data["escalation_message"] is not None
 
+    @pytest.mark.asyncio
+    async def test_equivalent_requests_reuse_retrieval(self, memory):
+        """Test reordered symptoms hit the retrieval cache with their own terms."""
+        agent = GuidelineRAGAgent(memory=memory)
+
+        first = await agent.run({"symptoms": ["fever", "difficulty_breathing"]})
+        second = await agent.run({"symptoms": ["Difficulty_Breathing", "fever"]})
+
+        assert agent.retrieval_cache.stats()["hits"] == 1
+        assert second.data["guidelines"] == first.data["guidelines"]
+        assert second.data["citations"] == first.data["citations"]
+        assert second.data["citations"] is not first.data["citations"]
+        assert second.request_id != first.request_id
+        assert "difficulty breathing" in second.data["search_terms"]
+
+    @pytest.mark.asyncio
+    async def test_requests_with_shared_tokens_do_not_share_results(self, memory):
+        """Test terms that tokenize alike but match topic keys differently are cached apart."""
+        shared = GuidelineRAGAgent(memory=memory)
+
+        for first_terms, second_terms in (
+            (["e"], ["o"]),
+            (["rash"], ["rash 2"]),
+            (["fever"], ["fever1"]),
+        ):
+            await shared.run({"symptoms": first_terms})
+            second = await shared.run({"symptoms": second_terms})
+            fresh = await GuidelineRAGAgent(memory=memory).run({"symptoms": second_terms})
+
+            assert second.data["guidelines"] == fresh.data["guidelines"]
+
+        assert shared.retrieval_cache.stats()["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_caregiver_phrasings_map_to_symptoms(self, memory):
+        """Test caregiver phrasings in symptoms and queries find their topic."""
+        agent = GuidelineRAGAgent(memory=memory)
+
+        for input_data in (
+            {"symptoms": ["throwing_up"]},
+            {"query": "my baby keeps throwing up since last night"},
+        ):
+            response = await agent.process(input_data)
+            assert "vomiting" in response.data["search_terms"]
+            titles = [g["title"] for g in response.data["guidelines"]]
+            assert any("Vomiting" in title for title in titles)
+
+    @pytest.mark.asyncio
+    async def test_retrieved_templates_per_symptom(self, memory):
+        """Test each symptom retrieves its own topic, without passing mentions."""
+        agent = GuidelineRAGAgent(memory=memory)
+        expected = {
+            ("fever",): {"Fever in Children"},
+            ("cough",): {"Cough in Children"},
+            ("vomiting",): {"Vomiting and Nausea in Children"},
+            ("rash",): {"Rashes in Children"},
+            ("difficulty_breathing",): {"Breathing Problems in Children"},
+            ("dehydration",): {"Dehydration in Children"},
+            ("lethargy",): {"Dehydration in Children"},
+            ("dry_mouth",): {"Dehydration in Children"},
+            ("fever", "cough", "runny_nose"): {"Fever in Children", "Cough in Children"},
+        }
+
+        for symptoms, titles in expected.items():
+            response = await agent.process({"symptoms": list(symptoms)})
+            assert {g["title"] for g in response.data["guidelines"]} == titles, symptoms
+
+    @pytest.mark.asyncio
+    async def test_caregiver_terms_retrieve_their_topic(self, memory):
+        """Test signs named only inside a guideline's text retrieve that guideline."""
+        agent = GuidelineRAGAgent(memory=memory)
+        expected = {
+            "wheezing": "Cough in Children",
+            "petechiae": "Rashes in Children",
+            "lethargy": "Dehydration in Children",
+            "dry mouth": "Dehydration in Children",
+            "sunken eyes": "Dehydration in Children",
+            "no tears": "Dehydration in Children",
+        }
+
+        for symptom, title in expected.items():
+            response = await agent.process({"symptoms": [symptom]})
+            assert [g["title"] for g in response.data["guidelines"]] == [title], symptom
+
+        # Words found about equally in several guidelines retrieve none of them
+        response = await agent.process({"query": "infant lasting respiratory"})
+        assert response.data["guidelines"] == []
+
+    def test_search_terms_keep_first_seen_order(self, memory):
+        """Test search terms are deduplicated in a stable order."""
+        agent = GuidelineRAGAgent(memory=memory)
+
+        terms = agent._extract_search_terms("fever and rash", ["Fever", "cough", "fever"])
+
+        assert terms == ["fever", "cough", "rash"]
+
+    @pytest.mark.asyncio
+    async def test_process_batch_matches_single_requests(self, memory):
+        """Test batched retrieval returns per-input responses in input order."""
+        inputs = [
+            {"symptoms": ["fever"], "risk_tier": "HIGH"},
+            {"symptoms": ["rash"]},
+            {"symptoms": ["Fever"], "risk_tier": "LOW"},
+            {"symptoms": ["fever"], "risk_tier": "HIGH"},
+        ]
+
+        batch = await GuidelineRAGAgent(memory=memory).process_batch(inputs)
+        single = GuidelineRAGAgent(memory=memory)
+        expected = [await single.process(input_data) for input_data in inputs]
+
+        assert [r.data for r in batch] == [r.data for r in expected]
+        assert batch[0].data["escalation_message"] is not None
+        assert batch[2].data["escalation_message"] is None
+        assert batch[0].data["guidelines"] is not batch[3].data["guidelines"]
+
+    def test_bm25_index_scores_terms_independently(self):
+        """Test each term retrieves only a clear best match and common words none."""
+        index = BM25Index(
+            {
+                "fever": "child fever fever temperature",
+                "rash": "child rash skin fever",
+                "cough": "child cough chest",
+                "vomiting": "child vomiting nausea",
+                "ear": "child ear pain",
+            }
+        )
+
+        scores = index.search(["fever", "cough", "child"])
+
+        assert set(scores) == {"fever", "cough"}
+        assert all(0 < score <= 1 for score in scores.values())
+        assert index.search(["child"]) == {}
+        # Matches the cough and vomiting documents equally, so singles out neither
+        assert index.search(["chest nausea"]) == {}
+
+
+class TestGuidelineCache:
+    """Tests for GuidelineCache."""
+
+    def test_lru_eviction_and_stats(self):
+        """Test least recently used entries are evicted."""
+        cache = GuidelineCache(maxsize=2)
+        cache.set(("a",), 1)
+        cache.set(("b",), 2)
+        assert cache.get(("a",)) == 1
+
+        cache.set(("c",), 3)
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("c",)) == 3
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["size"] == 2
+
 
 # =====================
 # Escalation Agent Tests
@@ -327,6 +558,36 @@ class TestEscalationAgent:
         assert response.data["urgency"] == "immediate"
         assert "911" in response.data["primary_action"]
 
+    @pytest.mark.asyncio
+    async def test_critical_visit_packet_on_request(self, memory):
+        """Test the visit packet is omitted for emergencies unless requested."""
+        agent = EscalationAgent(memory=memory)
+        input_data = {"risk_tier": "CRITICAL", "symptoms": ["seizure"]}
+
+        default = await agent.run(input_data)
+        requested = await agent.run(input_data, context={"include_packet": True})
+
+        assert default.data["visit_packet"] is None
+        assert "seizure" in requested.data["visit_packet"]["summary"]
+
+    @pytest.mark.asyncio
+    async def test_critical_responses_are_independent(self, memory):
+        """Test mutating one emergency response leaves the next intact."""
+        agent = EscalationAgent(memory=memory)
+        input_data = {"risk_tier": "CRITICAL"}
+
+        first = await agent.run(input_data)
+        expected = copy.deepcopy(first.data)
+        for value in first.data.values():
+            if isinstance(value, list):
+                value.clear()
+        second = await agent.run(input_data)
+
+        assert any(isinstance(value, list) and value for value in expected.values())
+        for key, value in expected.items():
+            if isinstance(value, list):
+                assert second.data[key] == value
+
     @pytest.mark.asyncio
     async def test_visit_packet_generation(self, memory, sample_input):
         """Test visit preparation packet generation."""
@@ -359,6 +620,88 @@ class TestEscalationAgent:
         assert response.success
         reminders = response.data["reminders"]
         assert len(reminders) > 0
+        # Channels serialize as plain strings
+        assert all(type(channel) is str for r in reminders for channel in r["channels"])
+
+    @pytest.mark.asyncio
+    async def test_cached_tier_checklist_not_shared(self, memory):
+        """Test cached per-tier output is copied into each response."""
+        agent = EscalationAgent(memory=memory)
+        input_data = {"risk_tier": "HIGH", "symptoms": ["fever"]}
+
+        first = await agent.run(input_data)
+        first.data["checklist"][0]["completed"] = True
+        second = await agent.run(input_data)
+
+        assert second.data["checklist"][0]["completed"] is False
+        assert second.data["guidance_message"] == first.data["guidance_message"]
+
+
+class TestGeoExposureAgent:
+    """Tests for GeoExposureAgent."""
+
+    @pytest.mark.asyncio
+    async def test_aqi_classification(self, memory):
+        """Test AQI category boundaries and non-integer readings."""
+        agent = GeoExposureAgent(memory=memory)
+
+        for aqi, category in [(50, "Good"), (51, "Moderate"), (151, "Unhealthy"), (50.5, None)]:
+            response = await agent.run({"environmental": {"aqi": aqi}})
+            assert response.data["conditions"]["aqi_category"] == category
+
+        response = await agent.run({"environmental": {"aqi": 175}})
+        assert response.data["alerts"][0]["severity"] == "high"
+
+    def test_pollen_checks_on_directly_built_conditions(self, memory):
+        """Test pollen alerts and correlations without going through parsing."""
+        agent = GeoExposureAgent(memory=memory)
+        conditions = EnvironmentalConditions(pollen_level="High")
+
+        alerts = agent._generate_alerts(conditions)
+        correlations = agent._correlate_symptoms(["itchy_eyes"], conditions)
+
+        assert [a.alert_type for a in alerts] == ["pollen"]
+        assert [c["factor"] for c in correlations] == ["pollen"]
+
+    def test_risk_score_bands(self, memory):
+        """Test risk score bands, including band edges and alert weights."""
+        agent = GeoExposureAgent(memory=memory)
+        readings = {
+            (None, None): 0.2,
+            (50, 32): 0.4,
+            (50.5, 45): 0.3,
+            (151, 70): 0.4,
+            (201, 85): 0.65,
+            (600, 95): 0.8,
+        }
+
+        for (aqi, temp), expected in readings.items():
+            conditions = EnvironmentalConditions(aqi=aqi, temperature_f=temp)
+            assert agent._calculate_risk_score(conditions, []) == pytest.approx(expected)
+
+        # AQI 175 scores 0.7, plus 0.2 for its high-severity alert
+        conditions = EnvironmentalConditions(aqi=175)
+        alerts = agent._generate_alerts(conditions)
+        assert agent._calculate_risk_score(conditions, alerts) == pytest.approx(0.9)
+
+    @pytest.mark.asyncio
+    async def test_process_batch_matches_single_requests(self, memory):
+        """Test batched analysis matches per-request analysis, alerts included."""
+        agent = GeoExposureAgent(memory=memory)
+        inputs = [
+            {"environmental": {}},
+            {"environmental": {"aqi": 175, "outdoor_temperature_f": 98}},
+            {"environmental": {"aqi": 320, "outdoor_temperature_f": 20}, "symptoms": ["cough"]},
+            {"environmental": {"aqi": 42, "pollen_level": "high"}, "symptoms": ["itchy_eyes"]},
+        ]
+
+        batch = await agent.process_batch(inputs)
+
+        for input_data, response in zip(inputs, batch, strict=True):
+            single = await agent.run(input_data)
+            assert response.data["alerts"] == single.data["alerts"]
+            assert response.data["recommendations"] == single.data["recommendations"]
+            assert response.data["risk_score"] == pytest.approx(single.data["risk_score"])
 
 
 # =====================
@@ -421,6 +764,136 @@ class TestAgentIntegration:
         recent = memory.short_term.get_recent(5)
         assert len(recent) > 0
 
+    @pytest.mark.asyncio
+    async def test_failed_process_returns_failure_response(self, memory, sample_input):
+        """Test an exception in process() becomes a finalized FAILED response."""
+        agent = IngestionAgent(memory=memory)
+
+        async def fail(input_data, context=None):
+            raise ValueError("bad reading")
+
+        agent.process = fail
+        response = await agent.run(sample_input)
+
+        assert response.status == AgentStatus.FAILED
+        assert response.agent_name == agent.name
+        assert response.error_message == "bad reading"
+        assert response.duration_ms is not None
+        assert response.started_at <= response.completed_at
+        assert agent.status == AgentStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_response_to_json_matches_to_dict(self, memory, sample_input):
+        """Test JSON serialization round-trips to the dict form."""
+        response = await IngestionAgent(memory=memory).run(sample_input)
+
+        payload = loads(response.to_json())
+        assert payload["status"] == "completed"
+        assert f"{response.to_dict()['status']}" == "completed"
+        assert payload["success"] is True
+        assert payload["request_id"] == response.request_id
+        assert payload["started_at"] == response.started_at.isoformat()
+        assert payload["completed_at"] == response.completed_at.isoformat()
+        assert payload["started_at_ms"] == int(response.started_at.timestamp() * 1000)
+        assert payload["completed_at_ms"] == int(response.completed_at.timestamp() * 1000)
+        assert payload["completed_at_ms"] >= payload["started_at_ms"]
+
+    def test_agent_leaves_caller_config_untouched(self, memory):
+        """Test the agent interns its own copy of the name, not the caller's."""
+        name = "".join(["custom", "_ingestion"])
+        config = AgentConfig(name=name, description="Custom ingestion")
+        agent = IngestionAgent(config=config, memory=memory)
+
+        assert config.name is name
+        assert agent.name == name
+
+    def test_short_term_batched_stores_respect_bounds(self):
+        """Test queued stores are visible on read and keep the size bound."""
+        memory = Memory(short_term_config={"max_items": 2})
+        items = [memory.store({"note": i}) for i in range(3)]
+        assert len(memory.short_term._pending) < 2
+        assert len(memory.short_term._items) == 2
+
+        recent = memory.short_term.get_recent()
+        assert [item.content["note"] for item in recent] == [2, 1]
+        assert memory.short_term.retrieve(items[0].id) is None
+        assert memory.short_term.retrieve(items[2].id) is items[2]
+
+    def test_short_term_expires_items_stored_out_of_order(self):
+        """Test an old item stored after newer ones still expires on read."""
+        memory = Memory(short_term_config={"ttl_minutes": 60})
+        fresh = memory.store({"note": "fresh"})
+        stale = memory.store({"note": "stale"})
+        stale.timestamp -= timedelta(hours=2)
+
+        assert memory.short_term.get_recent() == [fresh]
+        assert memory.short_term.get_recent(1) == [fresh]
+
+        memory.short_term.clear()
+        assert memory.short_term.get_recent() == []
+
+    @pytest.mark.asyncio
+    async def test_shared_memory_namespaces(self, sample_input):
+        """Test per-child namespaces isolate context and share semantic memory."""
+        shared = SharedMemory()
+        ingestion = IngestionAgent(memory=shared.root)
+
+        first = shared.namespace("child-a")
+        await ingestion.run(sample_input, memory=first)
+
+        assert len(first.short_term) == 1
+        assert len(shared.namespace("child-b").short_term) == 0
+        assert shared.namespace("child-a") is first
+        assert first.semantic is shared.semantic
+        assert len(shared.root.short_term) == 0
+
+    def test_shared_memory_evicts_least_recently_used(self):
+        """Test namespaces are evicted LRU once over the byte budget."""
+        shared = SharedMemory(max_bytes=150)
+        shared.namespace("child-a").store({"note": "x" * 100})
+        assert len(shared) == 1
+
+        shared.namespace("child-b").store({"note": "y" * 100})
+
+        assert len(shared) == 1
+        assert 100 < shared.total_bytes <= 150
+        assert shared.namespace("child-a").short_term.get_recent() == []
+
+    def test_shared_memory_caps_namespace_count(self, caplog):
+        """Test namespaces are evicted LRU past max_namespaces, logging at DEBUG."""
+        shared = SharedMemory(max_namespaces=2)
+        first = shared.namespace("child-a")
+        shared.namespace("child-b")
+        shared.namespace("child-a")
+
+        with caplog.at_level("INFO", logger="epcid"):
+            shared.namespace("child-c")
+
+        assert len(shared) == 2
+        assert "child-b" not in shared._namespaces
+        assert shared.namespace("child-a") is first
+        assert caplog.records == []
+
+    def test_shared_memory_counts_only_held_items(self):
+        """Test items rolling out of short-term memory free their bytes."""
+        shared = SharedMemory(max_bytes=1000, short_term_config={"max_items": 2})
+        other = shared.namespace("child-a")
+        other.store({"note": "x" * 100})
+
+        busy = shared.namespace("child-b")
+        for i in range(20):
+            busy.store({"note": str(i) * 100})
+
+        assert len(shared) == 2
+        assert shared.namespace("child-a") is other
+        assert [item.content for item in other.short_term.get_recent()] == [{"note": "x" * 100}]
+        assert shared.total_bytes == sum(
+            item.nbytes for item in other.short_term.get_recent() + busy.short_term.get_recent()
+        )
+
+        busy.clear_all()
+        assert shared.total_bytes == other.short_term.nbytes
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])